@@ -1,7 +1,8 @@
 import math
 import os
 import pandas as pd
-from multiprocessing import Process, Queue
+import converter
+import workers
 pd.options.mode.chained_assignment = None
 
 dic_naming = {
@@ -19,56 +20,50 @@ class UserInput:
 
         self.file_name = 'csv_files_dif_currencies'
         self.job_name = 'Аналитик'
+        self.processes = os.cpu_count()
 
 
-def fill_df(df, currencies):
-    currencies_to_work = list(currencies.loc[:, ~currencies.columns.isin(['date'])].columns.values) + ['RUR']
-    # df = df[df['salary_currency'].isin(currencies_to_work)]
-    df['salary'] = df.apply(lambda x: get_salary(x, currencies), axis=1)
+def fill_df(df, rates):
+    df['salary'] = converter.get_salary(df, rates)
     df.drop(columns=['salary_from', 'salary_to', 'salary_currency'], inplace=True)
     df = df.reindex(columns=['name', 'salary', 'area_name', 'published_at'], copy=True)
     return df
 
 
-def get_salary(x, currencies):
-    salary_from, salary_to, salary_currency, published_at = x.loc['salary_from'], x.loc['salary_to'], x.loc['salary_currency'], x.loc['published_at']
-    currencies_to_work = list(currencies.loc[:, ~currencies.columns.isin(['date'])].columns.values)
-    date = published_at[:7]
-    if math.isnan(salary_to) or math.isnan(salary_from):
-        salary = salary_to if math.isnan(salary_from) else salary_from
-    else:
-        salary = math.floor((salary_from + salary_to) / 2)
-    if salary_currency == 'RUR' or salary_currency not in currencies_to_work:
-        return salary
-    return math.floor(salary * currencies.loc[currencies['date'] == date][salary_currency].values[0])
+def init_worker(currencies_rates):
+    global rates
+    rates = currencies_rates
 
 
-def calc_year_stat_mp(file_name, job_name, q, currencies):
+def calc_area_stat(df):
+    # Частичные суммы по регионам для одного файла, суммируются в calc_area_stats.
+    # Первые 100 строк файла идут в пример преобразованных данных 3-3-2.csv.
+    area_stat = df.groupby('area_name').agg(vac_num=('name', 'count'),
+                                            salary_sum=('salary', 'sum'),
+                                            salary_num=('salary', 'count'))
+    return [df.shape[0], area_stat, df.head(100)]
+
+
+def calc_year_stat_mp(file_name, job_name):
     df = pd.read_csv(file_name)
-    df = fill_df(df, currencies)
+    df = fill_df(df, rates)
     data_job = df[df['name'].str.contains(job_name, case=False)]
 
-    q.put([int(df['published_at'].values[0][:4]), df.shape[0], math.floor(df['salary'].mean()), data_job.shape[0], math.floor(data_job['salary'].mean()), df])
+    return [int(df['published_at'].values[0][:4]), df.shape[0], math.floor(df['salary'].mean()), data_job.shape[0], math.floor(data_job['salary'].mean()), calc_area_stat(df)]
 
 
 def calc_year_stats_mp():
-    global year_by_vac_num, year_by_salary, year_by_vac_num_job, year_by_salary_job, df_res
-    process = []
-    q = Queue()
-    currencies = pd.read_csv('currencies.csv')
-    for file_name in os.listdir(user_input.file_name):
-        p = Process(target=calc_year_stat_mp, args=(user_input.file_name + '/' + file_name, user_input.job_name, q, currencies.copy()))
-        process.append(p)
-        p.start()
-
-    for p in process:
-        p.join(1)
-        data = q.get()
+    global year_by_vac_num, year_by_salary, year_by_vac_num_job, year_by_salary_job, area_res
+    rates = converter.melt_currencies(pd.read_csv('currencies.csv'))
+    tasks = [(user_input.file_name + '/' + file_name, user_input.job_name) for file_name in os.listdir(user_input.file_name)
+             if file_name.startswith('part_')]
+    for data in workers.imap(calc_year_stat_mp, tasks, processes=user_input.processes, ordered=False,
+                             initializer=init_worker, initargs=(rates,)):
         year_by_vac_num[data[0]] = data[1]
         year_by_salary[data[0]] = data[2]
         year_by_vac_num_job[data[0]] = data[3]
         year_by_salary_job[data[0]] = data[4]
-        df_res.append(data[5])
+        area_res.append(data[5])
 
     year_by_vac_num = dict(sorted(year_by_vac_num.items(), key=lambda i: i[0]))
     year_by_salary = dict(sorted(year_by_salary.items(), key=lambda i: i[0]))
@@ -78,30 +73,21 @@ def calc_year_stats_mp():
 
 def calc_area_stats():
     global vac_num_by_area, salary_by_area
-    # currencies = pd.read_csv('currencies.csv')
-    # df = pd.read_csv('csv_files_dif_currencies/part_2007.csv')
-    # df = fill_df(df, currencies)
-    df = pd.concat(df_res, ignore_index=True)
-    df.head(100).to_csv('3-3-2.csv', index=False, encoding='utf8')
-    all_vac_num = df.shape[0]
+    samples = sorted((data[2] for data in area_res), key=lambda sample: sample['published_at'].values[0][:4])
+    pd.concat(samples, ignore_index=True).head(100).to_csv('3-3-2.csv', index=False, encoding='utf8')
+    all_vac_num = sum(data[0] for data in area_res)
+    df = pd.concat([data[1] for data in area_res]).groupby(level=0).sum()
     vac_percent = int(all_vac_num * 0.01)
 
-    data = df.groupby('area_name')['name'] \
-        .count() \
+    data = df['vac_num'] \
         .apply(lambda x: round(x / all_vac_num, 4)) \
         .sort_values(ascending=False) \
         .head(10) \
         .to_dict()
     vac_num_by_area = data
 
-    area_vac_num = df.groupby('area_name')['name']\
-        .count()\
-        .loc[lambda x: x > vac_percent]\
-        .to_dict()
-
-    data = df.loc[df['area_name'].isin(area_vac_num.keys())]\
-        .groupby('area_name')['salary']\
-        .mean()\
+    df = df.loc[df['vac_num'] > vac_percent]
+    data = (df['salary_sum'] / df['salary_num'])\
         .apply(lambda x: math.floor(x))\
         .sort_values(ascending=False)\
         .head(10)\
@@ -125,7 +111,7 @@ if __name__ == '__main__':
     year_by_salary_job = {}
     vac_num_by_area = {}
     salary_by_area = {}
-    df_res = []
+    area_res = []
 
     user_input = UserInput()
     calc_year_stats_mp()
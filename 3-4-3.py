@@ -2,9 +2,12 @@ import math
 import os
 import shutil
 import pandas as pd
+import cache
+import converter
+import dates
 import separate
+import workers
 import report_3_4_3
-from multiprocessing import Process, Queue
 pd.options.mode.chained_assignment = None
 
 
@@ -31,55 +34,54 @@ class UserInput:
 
         self.file_name = 'vacancies_dif_currencies.csv'
         self.job_name = 'Аналитик'
+        self.processes = os.cpu_count()
         self.area_name = 'Москва'
 
 
-def fill_df(df, currencies):
-    currencies_to_work = list(currencies.loc[:, ~currencies.columns.isin(['date'])].columns.values) + ['RUR']
-    df = df[df['salary_currency'].isin(currencies_to_work)]
-    df['salary'] = df.apply(lambda x: get_salary(x, currencies), axis=1)
+def fill_df(df, rates):
+    df = df[df['salary_currency'].isin(converter.currencies_to_work(rates))]
+    df['salary'] = converter.get_salary(df, rates)
     df.drop(columns=['salary_from', 'salary_to', 'salary_currency'], inplace=True)
     df = df.reindex(columns=['name', 'salary', 'area_name', 'published_at'], copy=True)
+    df['published_at'] = dates.month_keys(df['published_at'])
     return df
 
 
-def get_salary(x, currencies):
-    salary_from, salary_to, salary_currency, published_at = x.loc['salary_from'], x.loc['salary_to'], x.loc['salary_currency'], x.loc['published_at']
-    date = published_at[:7]
-    if math.isnan(salary_to) or math.isnan(salary_from):
-        salary = salary_to if math.isnan(salary_from) else salary_from
-    else:
-        salary = math.floor((salary_from + salary_to) / 2)
-    if salary_currency == 'RUR':
-        return salary
-    return math.floor(salary * currencies.loc[currencies['date'] == date][salary_currency].values[0])
+def init_worker(currencies_rates):
+    global rates
+    rates = currencies_rates
+
 
+def calc_area_stat(df):
+    # Частичные суммы по регионам для одного файла, суммируются в calc_area_stats.
+    area_stat = df.groupby('area_name').agg(vac_num=('name', 'count'),
+                                            salary_sum=('salary', 'sum'),
+                                            salary_num=('salary', 'count'))
+    return [df.shape[0], area_stat]
 
-def calc_year_stat_mp(file_name, job_name, area_name, q, currencies):
-    df = pd.read_csv(file_name)
-    df = fill_df(df, currencies)
+
+def calc_year_stat_mp(file_name, job_name, area_name, cache_folder):
+    if file_name.endswith('.parquet'):
+        df = pd.read_parquet(file_name)
+    else:
+        df = pd.read_csv(file_name)
+        df = fill_df(df, rates)
+        df.to_parquet(os.path.join(cache_folder, os.path.basename(file_name)[:-len('.csv')] + '.parquet'), index=False)
     data_job = df[df['name'].str.contains(job_name, case=False)]
     data_job = data_job[data_job['area_name'].str.contains(area_name, case=False)]
 
-    q.put([int(df['published_at'].values[0][:4]), data_job.shape[0], math.floor(data_job['salary'].mean()), df])
+    return [int(df['published_at'].values[0][:4]), data_job.shape[0], math.floor(data_job['salary'].mean()), calc_area_stat(df)]
 
 
-def calc_year_stats_mp():
-    global st, df_res
-    process = []
-    q = Queue()
-    currencies = pd.read_csv('currencies.csv')
-    for file_name in os.listdir(temp_folder):
-        p = Process(target=calc_year_stat_mp, args=(temp_folder + '/' + file_name, user_input.job_name, user_input.area_name, q, currencies.copy()))
-        process.append(p)
-        p.start()
-
-    for p in process:
-        p.join(1)
-        data = q.get()
+def calc_year_stats_mp(folder, cache_folder):
+    global st, area_res
+    rates = converter.melt_currencies(pd.read_csv('currencies.csv'))
+    tasks = [(file_name, user_input.job_name, user_input.area_name, cache_folder) for file_name in cache.part_files(folder)]
+    for data in workers.imap(calc_year_stat_mp, tasks, processes=user_input.processes, ordered=False,
+                             initializer=init_worker, initargs=(rates,)):
         st.year_by_vac_num_job[data[0]] = data[1]
         st.year_by_salary_job[data[0]] = data[2]
-        df_res.append(data[3])
+        area_res.append(data[3])
 
     st.year_by_vac_num_job = dict(sorted(st.year_by_vac_num_job.items(), key=lambda i: i[0]))
     st.year_by_salary_job = dict(sorted(st.year_by_salary_job.items(), key=lambda i: i[0]))
@@ -87,30 +89,19 @@ def calc_year_stats_mp():
 
 def calc_area_stats():
     global st
-    # currencies = pd.read_csv('currencies.csv')
-    # df = pd.read_csv('csv_files_dif_currencies/part_2007.csv')
-    # df = fill_df(df, currencies)
-    # df.head(100).to_csv('3-4-1.csv', index=False, encoding='utf8')
-    df = pd.concat(df_res, ignore_index=True)
-    all_vac_num = df.shape[0]
+    all_vac_num = sum(data[0] for data in area_res)
+    df = pd.concat([data[1] for data in area_res]).groupby(level=0).sum()
     vac_percent = int(all_vac_num * 0.01)
 
-    data = df.groupby('area_name')['name'] \
-        .count() \
+    data = df['vac_num'] \
         .apply(lambda x: round(x / all_vac_num, 4)) \
         .sort_values(ascending=False) \
         .head(10) \
         .to_dict()
     st.vac_num_by_area = data
 
-    area_vac_num = df.groupby('area_name')['name']\
-        .count()\
-        .loc[lambda x: x > vac_percent]\
-        .to_dict()
-
-    data = df.loc[df['area_name'].isin(area_vac_num.keys())]\
-        .groupby('area_name')['salary']\
-        .mean()\
+    df = df.loc[df['vac_num'] > vac_percent]
+    data = (df['salary_sum'] / df['salary_num'])\
         .apply(lambda x: math.floor(x))\
         .sort_values(ascending=False)\
         .head(10)\
@@ -127,14 +118,20 @@ def print_stats():
 
 if __name__ == '__main__':
     st = Statistics()
-    df_res = []
+    area_res = []
     temp_folder = 'csv_files_dif_currencies_temp'
 
     user_input = UserInput()
-    separate.main(user_input.file_name, temp_folder)
-    calc_year_stats_mp()
+    cache_folder = cache.get_folder(user_input.file_name, 'currencies.csv', 'known_currencies')
+    if cache.is_ready(cache_folder):
+        calc_year_stats_mp(cache_folder, cache_folder)
+    else:
+        cache.prepare(cache_folder)
+        separate.main(user_input.file_name, temp_folder)
+        calc_year_stats_mp(temp_folder, cache_folder)
+        cache.mark_ready(cache_folder)
+        shutil.rmtree(rf'./{temp_folder}')
     calc_area_stats()
 
     report_3_4_3.main(user_input, st)
     print_stats()
-    shutil.rmtree(rf'./{temp_folder}')
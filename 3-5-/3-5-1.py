@@ -1,10 +1,21 @@
+import time
 import pandas as pd
-import sqlite3
+import bulk_loader
 
 
-conn = sqlite3.connect('currencies.sqlite')
-c = conn.cursor()
+start = time.perf_counter()
+conn = bulk_loader.connect('currencies.sqlite')
 
 df = pd.read_csv('../currencies.csv')
-df = df.to_sql('currencies', conn, if_exists='replace', index=False)
-conn.commit()
+conn.execute('DROP TABLE IF EXISTS currencies')
+conn.execute(f'CREATE TABLE currencies (date TEXT, {", ".join(f"{column} REAL" for column in df.columns[1:])})')
+count = bulk_loader.insert_chunks(conn, f'INSERT INTO currencies VALUES ({", ".join("?" * len(df.columns))})',
+                                  df.itertuples(index=False))
+
+# Те же курсы по одной строке на месяц и валюту: курс ищется по первичному ключу (date, currency).
+conn.execute('DROP TABLE IF EXISTS currency_rates')
+conn.execute('CREATE TABLE currency_rates (date TEXT, currency TEXT, rate REAL, PRIMARY KEY (date, currency)) WITHOUT ROWID')
+rates = df.melt(id_vars='date', var_name='currency', value_name='rate').dropna()
+count += bulk_loader.insert_chunks(conn, 'INSERT INTO currency_rates VALUES (?, ?, ?)', rates.itertuples(index=False))
+bulk_loader.finish(conn, count, start)
+conn.close()
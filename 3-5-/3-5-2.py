@@ -1,38 +1,62 @@
-import math
-import pandas as pd
-import sqlite3
-
-
-def get_salary(row):
-    salary_from, salary_to, salary_currency, published_at = row.loc['salary_from'], row.loc['salary_to'], row.loc['salary_currency'], row.loc['published_at']
-    currency_value = 0
-    if salary_currency in ['BYN', 'BYR', 'EUR', 'KZT', 'UAH', 'USD']:
-        salary_currency.replace('BYN', 'BYR')
-        currency_value = cur.execute("SELECT * FROM currencies WHERE date == :published_at", {"published_at": published_at}).fetchone()[currencies_col_id[salary_currency]]
-    elif salary_currency == 'RUR':
-        currency_value = 1
-
-    if math.isnan(salary_to) or math.isnan(salary_from):
-        salary = salary_to if math.isnan(salary_from) else salary_from
+import csv
+import time
+import bulk_loader
+import vacancies_db
+
+# Зарплата - середина вилки (или единственная граница), переведенная в рубли по курсу месяца публикации
+# и округленная вниз. Вакансии в валютах без курса получают зарплату 0, BYN считается по курсу BYR.
+convert_query = """INSERT INTO vacancies_dif_currencies (name, area_name, published_at, salary, year, month)
+                   SELECT name, area_name, published_at,
+                          CAST(salary * CASE WHEN salary_currency = 'RUR' THEN 1 ELSE IFNULL(rate, 0) END AS INTEGER),
+                          CAST(SUBSTR(published_at, 1, 4) AS INTEGER), CAST(SUBSTR(published_at, 6, 2) AS INTEGER)
+                   FROM (SELECT name, area_name, SUBSTR(published_at, 1, 7) AS published_at,
+                                CASE WHEN salary_from IS NULL OR salary_to IS NULL THEN IFNULL(salary_from, salary_to)
+                                     ELSE CAST((salary_from + salary_to) / 2 AS INTEGER) END AS salary,
+                                CASE salary_currency WHEN 'BYN' THEN 'BYR' ELSE salary_currency END AS salary_currency
+                         FROM staging) AS vacancies
+                   LEFT JOIN currencies.currency_rates AS rates
+                   ON rates.date = vacancies.published_at AND rates.currency = vacancies.salary_currency"""
+
+
+def read_rows(file_name):
+    with open(file_name, encoding='utf_8_sig') as file:
+        for row in csv.DictReader(file):
+            yield (row['name'], row['salary_from'] or None, row['salary_to'] or None, row['salary_currency'] or None,
+                   row['area_name'], row['published_at'])
+
+
+def convert_chunk(con):
+    con.execute(convert_query)
+    con.execute("DELETE FROM staging")
+
+
+def finish_load(con):
+    vacancies_db.create_indexes(con)
+    vacancies_db.refresh_summaries(con)
+
+
+def load(file_name, replace, chunk_size=100000):
+    # replace=True строит базу заново, иначе строки файла дописываются к уже загруженным,
+    # а сводные таблицы обновляются только на новые строки. Файл читается и переводится в рубли
+    # пачками по chunk_size строк, индексы при полной загрузке строятся после вставки.
+    start = time.perf_counter()
+    con = bulk_loader.connect("vacancies_dif_currencies.sqlite")
+    con.execute("ATTACH DATABASE 'currencies.sqlite' AS currencies")
+    vacancies_db.create_schema(con, replace)
+    con.execute("CREATE TEMP TABLE staging (name TEXT, salary_from REAL, salary_to REAL, salary_currency TEXT, "
+                "area_name TEXT, published_at TEXT)")
+    count = bulk_loader.insert_chunks(con, "INSERT INTO staging VALUES (?, ?, ?, ?, ?, ?)", read_rows(file_name),
+                                      chunk_size, convert_chunk)
+    bulk_loader.transaction(con, finish_load)
+    bulk_loader.finish(con, count, start)
+    con.close()
+
+
+if __name__ == '__main__':
+    # mode = input('Введите режим (Полный / Добавление): ')
+    mode = 'Полный'
+
+    if mode == 'Полный':
+        load("../vacancies_dif_currencies.csv", replace=True)
     else:
-        salary = math.floor((salary_from + salary_to) / 2)
-
-    if math.isnan(salary):
-        return salary
-
-    return math.floor(salary * currency_value)
-
-
-currencies_col_id = {"BYR": 1, "EUR": 2, "KZT": 3, "UAH": 4, "USD": 5}
-df = pd.read_csv("../vacancies_dif_currencies.csv")
-con = sqlite3.connect("currencies.sqlite")
-cur = con.cursor()
-
-df["published_at"] = df["published_at"].apply(lambda date: date[:7])
-df['salary'] = df.apply(lambda x: get_salary(x), axis=1)
-df.drop(columns=['salary_from', 'salary_to', 'salary_currency'], inplace=True)
-
-connect = sqlite3.connect("vacancies_dif_currencies.sqlite")
-cursor = con.cursor()
-df.to_sql(name="vacancies_dif_currencies", con=connect, if_exists='replace', index=False)
-connect.commit()
+        load("../HH_vacancies.csv", replace=False)
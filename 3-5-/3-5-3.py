@@ -1,5 +1,5 @@
-import sqlite3
 import pandas as pd
+import vacancies_db
 
 
 class Statistics:
@@ -14,43 +14,35 @@ class Statistics:
 
 st = Statistics()
 job_name = 'Аналитик'
-conn = sqlite3.connect("vacancies_dif_currencies.sqlite")
+conn = vacancies_db.connect("vacancies_dif_currencies.sqlite")
 cur = conn.cursor()
 
-st.year_by_salary = pd.read_sql("SELECT SUBSTR(published_at, 1, 4) as ""Год"", ROUND(AVG(salary)) as 'Средняя з\п' "
-                            "From vacancies_dif_currencies "
-                            "GROUP BY SUBSTR(published_at, 1, 4)", conn)
-
-st.year_by_vac_num = pd.read_sql("""SELECT SUBSTR(published_at, 1, 4) as 'Year', COUNT(*) as 'Vac_count' 
-                            from vacancies_dif_currencies 
-                            group by SUBSTR(published_at, 1, 4) """, conn)
-
-st.year_by_salary_job = pd.read_sql(f"""SELECT SUBSTR(published_at, 1, 4) as 'Год',
-                                                    ROUND(AVG(salary), 2) as 'Средняя з\п {job_name}'
-                                                    from vacancies_dif_currencies 
-                                                    where lower(name) LIKE '%{job_name.lower()}%'
-                                                    group by SUBSTR(published_at, 1, 4)""", conn)
-
-st.year_by_vac_num_job = pd.read_sql(f"""SELECT SUBSTR(published_at, 1, 4) as 'Год',
-                                                    COUNT(*) as 'Кол-во вакансий {job_name}'
-                                                    from vacancies_dif_currencies 
-                                                    where lower(name) LIKE '%{job_name.lower()}%'
-                                                    group by SUBSTR(published_at, 1, 4)""", conn)
-
-st.salary_by_area = pd.read_sql("""SELECT area_name as 'Город',  ROUND(AVG(salary), 2) as 'Средняя з\п'
-                                         from vacancies_dif_currencies 
-                                         group by area_name
-                                         having COUNT(*) >= (SELECT COUNT(*) FROM vacancies_dif_currencies) / 100
-                                         ORDER BY ROUND(AVG(salary), 2) DESC 
-                                         LIMIT 10""", conn)
-
-st.vac_num_by_area = pd.read_sql("""SELECT area_name as 'Город',
-                                                100 * COUNT(*)/(select COUNT(*) from vacancies_dif_currencies)  as 'Доля(%)'
-                                                from vacancies_dif_currencies
-                                                group by area_name
-                                                having COUNT(*) >= (SELECT COUNT(*) FROM vacancies_dif_currencies) / 100
-                                                ORDER BY COUNT(*) DESC 
-                                                LIMIT 10""", conn)
+# Общие показатели по годам и городам берутся из сводных таблиц, которые поддерживает загрузчик 3-5-2.
+st.year_by_salary = pd.read_sql("SELECT year as 'Год', ROUND(1.0 * salary_sum / salary_num) as 'Средняя з\\п' "
+                                "FROM year_stats "
+                                "ORDER BY year", conn)
+
+st.year_by_vac_num = pd.read_sql("""SELECT year as 'Year', vac_num as 'Vac_count'
+                                    FROM year_stats
+                                    ORDER BY year""", conn)
+
+job_stats = vacancies_db.profession_stats(conn, [job_name])[job_name]
+st.year_by_salary_job = pd.DataFrame(job_stats['year_by_salary_job'].items(),
+                                     columns=['Год', f'Средняя з\\п {job_name}'])
+st.year_by_vac_num_job = pd.DataFrame(job_stats['year_by_vac_num_job'].items(),
+                                      columns=['Год', f'Кол-во вакансий {job_name}'])
+
+st.salary_by_area = pd.read_sql("""SELECT area_name as 'Город', ROUND(1.0 * salary_sum / salary_num, 2) as 'Средняя з\\п'
+                                   FROM area_stats
+                                   WHERE vac_num >= (SELECT SUM(vac_num) FROM year_stats) / 100
+                                   ORDER BY ROUND(1.0 * salary_sum / salary_num, 2) DESC
+                                   LIMIT 10""", conn)
+
+st.vac_num_by_area = pd.read_sql("""SELECT area_name as 'Город', 100 * area_stats.vac_num / total.vac_num as 'Доля(%)'
+                                    FROM area_stats, (SELECT SUM(vac_num) as vac_num FROM year_stats) as total
+                                    WHERE area_stats.vac_num >= total.vac_num / 100
+                                    ORDER BY area_stats.vac_num DESC
+                                    LIMIT 10""", conn)
 
 print(f'Динамика уровня зарплат по годам:\n{st.year_by_salary}\n')
 print(f'Динамика количества вакансий по годам:\n{st.year_by_vac_num}\n')
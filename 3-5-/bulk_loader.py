@@ -0,0 +1,48 @@
+import sqlite3
+import time
+from itertools import islice
+
+
+def connect(file_name, cache_size=200000):
+    # Журнал WAL не блокирует читателей во время загрузки. В режиме WAL synchronous = NORMAL не портит базу
+    # при сбое и не ждет диска на каждой транзакции. Кэш страниц на время загрузки - cache_size КБ.
+    # Транзакции открываются явно, поэтому автоматические транзакции модуля sqlite3 отключены.
+    con = sqlite3.connect(file_name, isolation_level=None)
+    con.execute("PRAGMA journal_mode = WAL")
+    con.execute("PRAGMA synchronous = NORMAL")
+    con.execute(f"PRAGMA cache_size = -{cache_size}")
+    con.execute("PRAGMA temp_store = MEMORY")
+    return con
+
+
+def transaction(con, func, *args):
+    con.execute("BEGIN")
+    try:
+        result = func(con, *args)
+    except BaseException:
+        con.execute("ROLLBACK")
+        raise
+    con.execute("COMMIT")
+    return result
+
+
+def insert_chunks(con, query, rows, chunk_size=100000, after_chunk=None):
+    # Строки вставляются пачками по chunk_size через executemany, каждая пачка - в своей транзакции
+    # вместе с after_chunk(con), если он задан. Возвращает количество вставленных строк.
+    def insert(con, chunk):
+        con.executemany(query, chunk)
+        if after_chunk is not None:
+            after_chunk(con)
+
+    count = 0
+    rows = iter(rows)
+    while chunk := list(islice(rows, chunk_size)):
+        transaction(con, insert, chunk)
+        count += len(chunk)
+    return count
+
+
+def finish(con, count, start):
+    con.execute("ANALYZE")
+    elapsed = time.perf_counter() - start
+    print(f'Загружено строк: {count} за {elapsed:.2f} с ({count / elapsed:.0f} строк/с)')
@@ -0,0 +1,101 @@
+import sqlite3
+
+table_name = 'vacancies_dif_currencies'
+fts_table_name = 'vacancies_fts'
+summaries = {'year_stats': 'year', 'area_stats': 'area_name'}
+
+
+def contains(name, job_name):
+    return name is not None and job_name.lower() in name.lower()
+
+
+def connect(file_name):
+    con = sqlite3.connect(file_name)
+    con.create_function('contains', 2, contains, deterministic=True)
+    return con
+
+
+def create_schema(con, replace=False):
+    # Год и месяц публикации хранятся отдельными столбцами с индексами (create_indexes), а количество
+    # вакансий и суммы зарплат по годам и городам - в сводных таблицах, поэтому запросам 3-5-3 не нужен
+    # полный проход.
+    if replace:
+        for table in [fts_table_name, table_name, 'summary_state', *summaries]:
+            con.execute(f"DROP TABLE IF EXISTS {table}")
+    con.execute(f"CREATE TABLE IF NOT EXISTS {table_name} (id INTEGER PRIMARY KEY, name TEXT, area_name TEXT, "
+                f"published_at TEXT, salary INTEGER, year INTEGER, month INTEGER)")
+    # Названия вакансий в полнотекстовом индексе из триграмм без учета регистра (с Unicode-свертыванием),
+    # фраза из трех и более символов ищется по нему как подстрока.
+    con.execute(f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts_table_name} USING fts5(name, content='{table_name}', "
+                f"content_rowid='id', tokenize='trigram case_sensitive 0')")
+    con.execute("CREATE TABLE IF NOT EXISTS year_stats (year INTEGER PRIMARY KEY, "
+                "vac_num INTEGER, salary_sum INTEGER, salary_num INTEGER)")
+    con.execute("CREATE TABLE IF NOT EXISTS area_stats (area_name TEXT PRIMARY KEY, "
+                "vac_num INTEGER, salary_sum INTEGER, salary_num INTEGER)")
+    con.execute("CREATE TABLE IF NOT EXISTS summary_state (id INTEGER PRIMARY KEY CHECK (id = 1), last_rowid INTEGER)")
+    con.execute("INSERT OR IGNORE INTO summary_state VALUES (1, 0)")
+
+
+def create_indexes(con):
+    # При полной загрузке индексы строятся один раз после вставки всех строк.
+    con.execute(f"CREATE INDEX IF NOT EXISTS {table_name}_year ON {table_name} (year)")
+    con.execute(f"CREATE INDEX IF NOT EXISTS {table_name}_area_name ON {table_name} (area_name)")
+
+
+def refresh_summaries(con):
+    # В сводные таблицы и полнотекстовый индекс добавляются только строки, вставленные после прошлого обновления.
+    last_rowid = con.execute("SELECT last_rowid FROM summary_state").fetchone()[0]
+    max_rowid = con.execute(f"SELECT IFNULL(MAX(id), 0) FROM {table_name}").fetchone()[0]
+    con.execute(f"INSERT INTO {fts_table_name} (rowid, name) SELECT id, name FROM {table_name} "
+                f"WHERE id > ? AND id <= ?", (last_rowid, max_rowid))
+    for summary, column in summaries.items():
+        con.execute(f"""INSERT INTO {summary}
+                        SELECT {column}, COUNT(*), IFNULL(SUM(salary), 0), COUNT(salary) FROM {table_name}
+                        WHERE id > :last_rowid AND id <= :max_rowid
+                        GROUP BY {column}
+                        ON CONFLICT ({column}) DO UPDATE SET vac_num = vac_num + excluded.vac_num,
+                                                             salary_sum = salary_sum + excluded.salary_sum,
+                                                             salary_num = salary_num + excluded.salary_num""",
+                    {'last_rowid': last_rowid, 'max_rowid': max_rowid})
+    con.execute("UPDATE summary_state SET last_rowid = ?", (max_rowid,))
+
+
+def fts_phrase(job_name):
+    return '"' + job_name.replace('"', '""') + '"'
+
+
+def profession_stats(con, job_names):
+    # Средняя зарплата и количество вакансий по годам сразу для всех профессий одним запросом. Название
+    # профессии ищется без учета регистра как подстрока, как str.contains(job_name, case=False) в pandas:
+    # профессии кладутся во временную таблицу и соединяются с триграммным индексом, а названия короче
+    # трех символов, которые индекс искать не умеет, проверяются одним общим проходом по таблице.
+    job_names = list(dict.fromkeys(job_names))
+    with con:
+        con.execute("CREATE TEMP TABLE IF NOT EXISTS professions (job_name TEXT, phrase TEXT)")
+        con.execute("DELETE FROM professions")
+        con.executemany("INSERT INTO professions VALUES (?, ?)",
+                        [(job_name, fts_phrase(job_name) if len(job_name) >= 3 else None) for job_name in job_names])
+    parts = []
+    if any(len(job_name) >= 3 for job_name in job_names):
+        parts.append(f"""SELECT professions.job_name, vacancies.year, vacancies.salary
+                         FROM professions
+                         JOIN {fts_table_name} ON {fts_table_name} MATCH professions.phrase
+                         JOIN {table_name} AS vacancies ON vacancies.id = {fts_table_name}.rowid
+                         WHERE professions.phrase IS NOT NULL""")
+    if any(len(job_name) < 3 for job_name in job_names):
+        parts.append(f"""SELECT professions.job_name, vacancies.year, vacancies.salary
+                         FROM {table_name} AS vacancies
+                         JOIN professions ON contains(vacancies.name, professions.job_name)
+                         WHERE professions.phrase IS NULL""")
+
+    stats = {job_name: {'year_by_salary_job': {}, 'year_by_vac_num_job': {}} for job_name in job_names}
+    if not parts:
+        return stats
+    query = f"""SELECT job_name, year, ROUND(AVG(salary), 2), COUNT(*)
+                FROM ({' UNION ALL '.join(parts)})
+                GROUP BY job_name, year
+                ORDER BY job_name, year"""
+    for job_name, year, salary, vac_num in con.execute(query):
+        stats[job_name]['year_by_salary_job'][year] = salary
+        stats[job_name]['year_by_vac_num_job'][year] = vac_num
+    return stats
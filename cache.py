@@ -0,0 +1,67 @@
+import hashlib
+import json
+import os
+import shutil
+
+cache_folder = 'vacancies_cache'
+hashes_file = os.path.join(cache_folder, 'hashes.json')
+ready_file = '_SUCCESS'
+
+
+def file_hash(file_name):
+    digest = hashlib.sha256()
+    with open(file_name, 'rb') as file:
+        for block in iter(lambda: file.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def read_hashes():
+    if not os.path.exists(hashes_file):
+        return {}
+    with open(hashes_file, encoding='utf8') as file:
+        return json.load(file)
+
+
+def source_hash(file_name):
+    # Содержимое файла хэшируется заново, только если у него изменились размер или время изменения.
+    stat = os.stat(file_name)
+    hashes = read_hashes()
+    key = os.path.abspath(file_name)
+    entry = hashes.get(key)
+    if entry is None or entry['size'] != stat.st_size or entry['mtime'] != stat.st_mtime_ns:
+        entry = {'size': stat.st_size, 'mtime': stat.st_mtime_ns, 'hash': file_hash(file_name)}
+        hashes[key] = entry
+        os.makedirs(cache_folder, exist_ok=True)
+        with open(hashes_file, 'w', encoding='utf8') as file:
+            json.dump(hashes, file)
+    return entry['hash']
+
+
+def get_folder(file_name, currencies_file, variant):
+    # Папка кэша зависит от содержимого исходного файла, файла курсов валют и варианта обработки.
+    key = hashlib.sha256(f'{source_hash(file_name)}|{source_hash(currencies_file)}|{variant}'.encode()).hexdigest()
+    return os.path.join(cache_folder, f'{variant}-{key[:16]}')
+
+
+def is_ready(folder):
+    return os.path.exists(os.path.join(folder, ready_file))
+
+
+def prepare(folder):
+    shutil.rmtree(folder, ignore_errors=True)
+    os.makedirs(folder)
+
+
+def mark_ready(folder):
+    open(os.path.join(folder, ready_file), 'w').close()
+    # Кэши этого же варианта, построенные по старым версиям файлов, больше не нужны.
+    variant = os.path.basename(folder).rsplit('-', 1)[0]
+    for name in os.listdir(cache_folder):
+        path = os.path.join(cache_folder, name)
+        if path != folder and os.path.isdir(path) and name.rsplit('-', 1)[0] == variant:
+            shutil.rmtree(path, ignore_errors=True)
+
+
+def part_files(folder):
+    return [os.path.join(folder, file_name) for file_name in os.listdir(folder) if file_name.startswith('part_')]
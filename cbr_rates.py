@@ -0,0 +1,85 @@
+import os
+import threading
+from datetime import date
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+import requests
+import pandas as pd
+
+cbr_url = 'https://www.cbr.ru/scripts/XML_daily.asp'
+cache_folder = 'cbr_cache'
+currencies = ['BYR', 'EUR', 'KZT', 'UAH', 'USD']
+aliases = {'BYN': 'BYR'}
+local = threading.local()
+
+
+def get_session():
+    # У каждого потока своя сессия, соединение с сервером переиспользуется между запросами.
+    if not hasattr(local, 'session'):
+        local.session = requests.Session()
+    return local.session
+
+
+def parse_rates(xml):
+    # Курсы всех валют из одного ответа ЦБ за один проход: код валюты -> рублей за единицу.
+    rates = {}
+    for valute in ET.fromstring(xml).iter('Valute'):
+        code = valute.findtext('CharCode')
+        value = float(valute.findtext('Value').replace(',', '.')) / int(valute.findtext('Nominal'))
+        rates.setdefault(aliases.get(code, code), value)
+    return rates
+
+
+def fetch_month(month, base_url=cbr_url, folder=cache_folder):
+    # month в формате YYYY-MM. Ответ сохраняется на диск и повторно не запрашивается.
+    cache_file = os.path.join(folder, f'{month}.xml')
+    if os.path.exists(cache_file):
+        with open(cache_file, 'rb') as file:
+            return file.read()
+    response = get_session().get(f'{base_url}?date_req=01/{month[5:]}/{month[:4]}', timeout=30)
+    response.raise_for_status()
+    with open(cache_file + '.tmp', 'wb') as file:
+        file.write(response.content)
+    os.replace(cache_file + '.tmp', cache_file)
+    return response.content
+
+
+def fetch_months(months, base_url=cbr_url, folder=cache_folder, workers=8):
+    os.makedirs(folder, exist_ok=True)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(lambda month: fetch_month(month, base_url, folder), months))
+
+
+def get_rates(months, base_url=cbr_url, folder=cache_folder, workers=8):
+    rows = []
+    for month, xml in zip(months, fetch_months(months, base_url, folder, workers)):
+        rates = parse_rates(xml)
+        rows.append([month] + [rates.get(code) for code in currencies])
+    return pd.DataFrame(rows, columns=['date'] + currencies)
+
+
+def next_month(month):
+    year, month = int(month[:4]), int(month[5:])
+    return f'{year + month // 12}-{month % 12 + 1:02d}'
+
+
+def month_range(start, end):
+    # Все месяцы от start до end включительно в формате YYYY-MM.
+    months = []
+    while start <= end:
+        months.append(start)
+        start = next_month(start)
+    return months
+
+
+def update_csv(file_name='currencies.csv', until=None, base_url=cbr_url, folder=cache_folder, workers=8):
+    # Дописывает в file_name курсы за месяцы после последней даты в файле по until (по умолчанию текущий месяц).
+    # Файл заменяется целиком только после того, как все месяцы получены.
+    data = pd.read_csv(file_name)
+    months = month_range(next_month(data['date'].max()), until or date.today().strftime('%Y-%m'))
+    if not months:
+        return data
+    data = pd.concat([data, get_rates(months, base_url, folder, workers)], ignore_index=True)
+    data.to_csv(file_name + '.tmp', index=False)
+    os.replace(file_name + '.tmp', file_name)
+    return data
@@ -1,10 +1,16 @@
+import os
 import pandas as pd
 
 file = '../vacancies_dif_currencies.csv'
-df = pd.read_csv(file)
+folder = 'csv_files_dif_currencies'
 
-df['year'] = df['published_at'].apply(lambda x: x[0:4])
-df_group = df.groupby('year')
+os.makedirs(folder, exist_ok=True)
+for file_name in os.listdir(folder):
+    if file_name.startswith('part_'):
+        os.remove(os.path.join(folder, file_name))
 
-for year, data in df_group:
-    data.loc[:, data.columns != 'year'].to_csv(rf'csv_files_dif_currencies\part_{year}.csv', index=False)
+for chunk in pd.read_csv(file, chunksize=100000):
+    chunk['year'] = chunk['published_at'].str[:4]
+    for year, data in chunk.groupby('year'):
+        part_file = os.path.join(folder, f'part_{year}.csv')
+        data.loc[:, data.columns != 'year'].to_csv(part_file, mode='a', index=False, header=not os.path.exists(part_file))
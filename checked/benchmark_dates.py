@@ -0,0 +1,41 @@
+import random
+import timeit
+from datetime import datetime
+import dateutil.parser
+import pandas as pd
+import report
+
+rows_count = 20000
+
+
+def dotdict_per_row(date):  # Прежний Vacancy.date_format: новый класс на каждую строку.
+    class dotdict(dict):
+        __getattr__ = dict.get
+        __setattr__ = dict.__setitem__
+        __delattr__ = dict.__delitem__
+
+    return dotdict({'year': date[0:4]})
+
+
+variants = {
+    'dotdict в функции': dotdict_per_row,
+    'datetime.strptime': lambda date: datetime.strptime(date, "%Y-%m-%dT%H:%M:%S%z"),
+    'dateutil.parser.parse': dateutil.parser.parse,
+    'срез строки': lambda date: date[0:4],
+    'pd.to_datetime': pd.to_datetime,
+    'parse_month (кэш)': report.Vacancy.date_format,
+}
+
+
+def make_dates(count):
+    random.seed(0)
+    return [datetime(random.randint(2003, 2022), random.randint(1, 12), random.randint(1, 28), random.randint(0, 23),
+                     random.randint(0, 59), random.randint(0, 59)).strftime('%Y-%m-%dT%H:%M:%S+0300')
+            for _ in range(count)]
+
+
+if __name__ == '__main__':
+    dates = make_dates(rows_count)
+    for name, date_format in variants.items():
+        seconds = min(timeit.repeat(lambda: [date_format(date) for date in dates], number=1, repeat=3))
+        print(f'{name:25}{seconds * 1e9 / rows_count:10.0f} нс на строку')
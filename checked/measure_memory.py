@@ -0,0 +1,45 @@
+import csv
+import io
+import sys
+import tracemalloc
+from types import SimpleNamespace
+import report
+import table
+
+rows_count = 100000
+table_row = ['Программист Python', 'Описание вакансии', 'Python\nSQL\nGit', 'between1And3', 'False', 'ООО Ромашка',
+             '100000.0', '150000.0', 'True', 'RUR', 'Москва', '2022-07-05T18:19:30+0300']
+report_row = ['Программист Python', '100000.0', '150000.0', 'RUR', 'Москва', '2022-07-05T18:19:30+0300']
+
+
+def read_rows(row, count):
+    # Каждая строка читается из CSV заново, чтобы у вакансий были свои объекты строк, как при чтении файла.
+    text = io.StringIO()
+    csv.writer(text).writerows([row] * count)
+    text.seek(0)
+    return csv.reader(text)
+
+
+def object_size(vacancy):
+    size = sys.getsizeof(vacancy) + sys.getsizeof(vacancy.salary)
+    for obj in [vacancy, vacancy.salary]:
+        if hasattr(obj, '__dict__'):
+            size += sys.getsizeof(obj.__dict__)
+    return size
+
+
+def measure(name, make, row):
+    rows = list(read_rows(row, rows_count))
+    tracemalloc.start()
+    vacancies = [make(vacancy_data) for vacancy_data in rows]
+    current = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print(f'{name}: {current / rows_count:.0f} байт на строку, '
+          f'из них объекты Vacancy и Salary: {object_size(vacancies[0])} байт')
+
+
+if __name__ == '__main__':
+    st = report.Statistics()
+    user_input = SimpleNamespace(job_name='Аналитик')
+    measure('report.Vacancy', lambda vacancy_data: report.Vacancy(vacancy_data, st, user_input), report_row)
+    measure('table.Vacancy', table.Vacancy, table_row)
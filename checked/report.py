@@ -6,6 +6,8 @@ import os.path
 import pdfkit
 import numpy as np
 import matplotlib.pyplot as plt
+from collections import namedtuple
+from functools import lru_cache
 from jinja2 import Environment, FileSystemLoader, Template
 from openpyxl import Workbook
 from openpyxl.styles import Font, Border, Side, Alignment
@@ -30,6 +32,17 @@ currency_to_rub = {
     "UZS": 0.0055,
 }
 
+html_tag_pattern = re.compile('<.*?>')
+clean_value_pattern = re.compile(r'[^<\s]+(?: [^<\s]+)*')  # Значение без тегов, переносов и лишних пробелов.
+
+PublishedDate = namedtuple('PublishedDate', ['year', 'month'])
+
+
+@lru_cache(maxsize=None)
+def parse_month(month):
+    # month в формате YYYY-MM. Месяцев в файле немного, поэтому у вакансий одного месяца общий объект даты.
+    return PublishedDate(int(month[:4]), int(month[5:7]))
+
 
 class UserInput:
     def __init__(self):
@@ -54,68 +67,78 @@ class DataSet:
     def __init__(self, st, user_input):
         self.file_name = user_input.file_name
         self.csv_headers, self.read_data = self.csv_reader()
-        self.vacancies_objects = []
+        self.vacancies_count = 0
         self.csv_filter(st, user_input)
 
     def csv_reader(self):
         vacancies_file = open(self.file_name, encoding='utf_8_sig')
         vacancies_reader = csv.reader(vacancies_file)
-        file_len = len(vacancies_file.readlines())
-        if file_len == 0:
+        csv_headers = next(vacancies_reader, None)
+        if csv_headers is None:
+            vacancies_file.close()
             print("Пустой файл")
             sys.exit()
-        elif file_len == 1:
+        first_row = next(vacancies_reader, None)
+        if first_row is None:
+            vacancies_file.close()
             print("Нет данных")
             sys.exit()
-        vacancies_file.seek(0)
-        return [vacancies_reader.__next__(), [x for x in vacancies_reader]]
+        return [csv_headers, self.read_rows(vacancies_file, vacancies_reader, first_row)]
+
+    @staticmethod
+    def read_rows(vacancies_file, vacancies_reader, first_row):
+        with vacancies_file:
+            yield first_row
+            yield from vacancies_reader
 
     def csv_filter(self, st, user_input):
         for vacancy_data in self.read_data:
             if len(vacancy_data) == len(self.csv_headers) and vacancy_data.count('') == 0:
-                self.vacancies_objects.append(Vacancy(vacancy_data, st, user_input))
+                Vacancy(vacancy_data, st, user_input)
+                self.vacancies_count += 1
 
 
 class Vacancy:
+    __slots__ = ('name', 'salary', 'area_name', 'published_at')
+
     def __init__(self, vacancy_data, st, user_input):
-        vacancy_data = [self.clean_value(s.split('\n')) for s in vacancy_data]
+        # От html тегов и лишних пробелов очищаются только текстовые поля, оклад, валюта и дата берутся как есть.
         i, c = 0, 0
         if len(vacancy_data) > 6:
             i, c = 5, 6
-        self.name = vacancy_data[0]
+        self.name = self.clean_field(vacancy_data[0])
         self.salary = Salary(vacancy_data[i + 1],
                              vacancy_data[i + 2],
                              vacancy_data[c + 3])
-        self.area_name = vacancy_data[c + 4]
+        self.area_name = self.clean_field(vacancy_data[c + 4])
         self.published_at = self.date_format(vacancy_data[c + 5])
 
         st.add_data(self, user_input)
 
     @staticmethod
     def date_format(date):
-        class dotdict(dict):  # Для получения значения через точку.
-            """dot.notation access to dictionary attributes"""
-            __getattr__ = dict.get
-            __setattr__ = dict.__setitem__
-            __delattr__ = dict.__delitem__
+        return parse_month(date[:7])  # Для статистики нужны только год и месяц.
 
-        return dotdict({'year': date[0:4]})  # Для статистики нужен только год.
+    @staticmethod
+    def clean_field(value):
+        # Уже чистое значение возвращается как есть, без разбиения на строки и замен.
+        if clean_value_pattern.fullmatch(value):
+            return value
+        return Vacancy.clean_value(value.split('\n'))
 
     @staticmethod
     def clean_value(strings):
-        html_tag_pattern = re.compile('<.*?>')
         result = []
         for string in strings:
-            string = re.sub(html_tag_pattern, '', string)
-            string = ' '.join(string.split())
-            string = string.strip()
-            result.append(string)
+            result.append(' '.join(html_tag_pattern.sub('', string).split()))
         if len(result) == 1:
             return result[0]
         return result
 
 
 class Salary:
+    __slots__ = ('salary_from', 'salary_to', 'salary_currency', 'average_salary')
+
     def __init__(self, salary_from, salary_to, salary_currency):
         self.salary_from = float(salary_from)
         self.salary_to = float(salary_to)
@@ -125,39 +148,56 @@ class Salary:
 
 
 class Statistics:
+    sums = ['year_to_salary_sum', 'year_to_vac_num', 'year_to_salary_for_job_sum', 'year_to_vac_num_for_job',
+            'area_to_salary_sum', 'area_to_vac_num']
+
     def __init__(self):
-        self.year_to_salary = {}
+        self.year_to_salary_sum = {}
         self.year_to_vac_num = {}
-        self.year_to_salary_for_job = {}
+        self.year_to_salary_for_job_sum = {}
         self.year_to_vac_num_for_job = {}
-        self.area_to_salary = {}
+        self.area_to_salary_sum = {}
         self.area_to_vac_num = {}
+        self.year_to_salary = {}
+        self.year_to_salary_for_job = {}
+        self.area_to_salary = {}
         self.sorted_area_salary = {}
         self.sorted_area_num = {}
 
     def add_data(self, vacancy, user_input):
-        self.year_to_salary[vacancy.published_at.year] = self.year_to_salary.setdefault(vacancy.published_at.year, 0) + vacancy.salary.average_salary
-        self.year_to_vac_num[vacancy.published_at.year] = self.year_to_vac_num.setdefault(vacancy.published_at.year, 0) + 1
-        self.area_to_salary[vacancy.area_name] = self.area_to_salary.setdefault(vacancy.area_name, 0) + vacancy.salary.average_salary
+        year = vacancy.published_at.year
+        self.year_to_salary_sum[year] = self.year_to_salary_sum.setdefault(year, 0) + vacancy.salary.average_salary
+        self.year_to_vac_num[year] = self.year_to_vac_num.setdefault(year, 0) + 1
+        self.area_to_salary_sum[vacancy.area_name] = self.area_to_salary_sum.setdefault(vacancy.area_name, 0) + vacancy.salary.average_salary
         self.area_to_vac_num[vacancy.area_name] = self.area_to_vac_num.setdefault(vacancy.area_name, 0) + 1
         if user_input.job_name.lower() in vacancy.name.lower():
-            self.year_to_salary_for_job[vacancy.published_at.year] = self.year_to_salary_for_job.setdefault(vacancy.published_at.year, 0) + vacancy.salary.average_salary
-            self.year_to_vac_num_for_job[vacancy.published_at.year] = self.year_to_vac_num_for_job.setdefault(vacancy.published_at.year, 0) + 1
+            self.year_to_salary_for_job_sum[year] = self.year_to_salary_for_job_sum.setdefault(year, 0) + vacancy.salary.average_salary
+            self.year_to_vac_num_for_job[year] = self.year_to_vac_num_for_job.setdefault(year, 0) + 1
         else:
-            self.year_to_salary_for_job[vacancy.published_at.year] = self.year_to_salary_for_job.setdefault(vacancy.published_at.year, 0)
-            self.year_to_vac_num_for_job[vacancy.published_at.year] = self.year_to_vac_num_for_job.setdefault(vacancy.published_at.year, 0)
-
-    def calc_average(self, data_set):
-        self.year_to_salary = {k: self.average(k, v, self.year_to_vac_num) for k, v in self.year_to_salary.items()}
-        self.area_to_salary = {k: self.average(k, v, self.area_to_vac_num) for k, v in self.area_to_salary.items()}
-        self.year_to_salary_for_job = {k: self.average(k, v, self.year_to_vac_num_for_job) for k, v in self.year_to_salary_for_job.items()}
+            self.year_to_salary_for_job_sum.setdefault(year, 0)
+            self.year_to_vac_num_for_job.setdefault(year, 0)
+
+    def merge(self, other):
+        for name in self.sums:
+            data = getattr(self, name)
+            for key, value in getattr(other, name).items():
+                data[key] = data.get(key, 0) + value
+        return self
+
+    def finalize(self):
+        vacancies_count = sum(self.year_to_vac_num.values())
+        self.year_to_vac_num = dict(sorted(self.year_to_vac_num.items()))
+        self.year_to_vac_num_for_job = dict(sorted(self.year_to_vac_num_for_job.items()))
+        self.year_to_salary = {k: self.average(k, v, self.year_to_vac_num) for k, v in sorted(self.year_to_salary_sum.items())}
+        self.area_to_salary = {k: self.average(k, v, self.area_to_vac_num) for k, v in self.area_to_salary_sum.items()}
+        self.year_to_salary_for_job = {k: self.average(k, v, self.year_to_vac_num_for_job) for k, v in sorted(self.year_to_salary_for_job_sum.items())}
 
         area_salary_cut = {k: v for k, v in self.area_to_salary.items() if
-                           self.area_to_vac_num[k] >= int(len(data_set.vacancies_objects) * 0.01)}
+                           self.area_to_vac_num[k] >= int(vacancies_count * 0.01)}
         self.sorted_area_salary = dict(sorted(area_salary_cut.items(), key=lambda i: i[1], reverse=True)[:10])
 
-        area_num_cut = {k: round(v / len(data_set.vacancies_objects), 4) for k, v in self.area_to_vac_num.items() if
-                        self.area_to_vac_num[k] >= int(len(data_set.vacancies_objects) * 0.01)}
+        area_num_cut = {k: round(v / vacancies_count, 4) for k, v in self.area_to_vac_num.items() if
+                        self.area_to_vac_num[k] >= int(vacancies_count * 0.01)}
         self.sorted_area_num = dict(sorted(area_num_cut.items(), key=lambda i: i[1], reverse=True)[:10])
 
     @staticmethod
@@ -350,6 +390,6 @@ def main():
     user_input = UserInput()
     st = Statistics()
     data_set = DataSet(st, user_input)
-    st.calc_average(data_set)
+    st.finalize()
     rep = Report(user_input)
     rep.generate_pdf(st, user_input)
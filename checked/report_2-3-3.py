@@ -6,6 +6,8 @@ import os.path
 import pdfkit
 import numpy as np
 import matplotlib.pyplot as plt
+from collections import namedtuple
+from functools import lru_cache
 import pandas as pd
 from datetime import datetime
 from jinja2 import Environment, FileSystemLoader, Template
@@ -33,6 +35,17 @@ currency_to_rub = {
     "UZS": 0.0055,
 }
 
+html_tag_pattern = re.compile('<.*?>')
+clean_value_pattern = re.compile(r'[^<\s]+(?: [^<\s]+)*')  # Значение без тегов, переносов и лишних пробелов.
+
+PublishedDate = namedtuple('PublishedDate', ['year', 'month'])
+
+
+@lru_cache(maxsize=None)
+def parse_month(month):
+    # month в формате YYYY-MM. Месяцев в файле немного, поэтому у вакансий одного месяца общий объект даты.
+    return PublishedDate(int(month[:4]), int(month[5:7]))
+
 
 class UserInput:
     def __init__(self):
@@ -47,39 +60,50 @@ class DataSet:
     def __init__(self, st, user_input):
         self.file_name = user_input.file_name
         self.csv_headers, self.read_data = self.csv_reader()
-        self.vacancies_objects = []
+        self.vacancies_count = 0
         self.csv_filter(st, user_input)
 
     def csv_reader(self):
         vacancies_file = open(self.file_name, encoding='utf_8_sig')
         vacancies_reader = csv.reader(vacancies_file)
-        file_len = len(vacancies_file.readlines())
-        if file_len == 0:
+        csv_headers = next(vacancies_reader, None)
+        if csv_headers is None:
+            vacancies_file.close()
             print("Пустой файл")
             sys.exit()
-        elif file_len == 1:
+        first_row = next(vacancies_reader, None)
+        if first_row is None:
+            vacancies_file.close()
             print("Нет данных")
             sys.exit()
-        vacancies_file.seek(0)
-        return [vacancies_reader.__next__(), [x for x in vacancies_reader]]
+        return [csv_headers, self.read_rows(vacancies_file, vacancies_reader, first_row)]
+
+    @staticmethod
+    def read_rows(vacancies_file, vacancies_reader, first_row):
+        with vacancies_file:
+            yield first_row
+            yield from vacancies_reader
 
     def csv_filter(self, st, user_input):
         for vacancy_data in self.read_data:
             if len(vacancy_data) == len(self.csv_headers) and vacancy_data.count('') == 0:
-                self.vacancies_objects.append(Vacancy(vacancy_data, st, user_input))
+                Vacancy(vacancy_data, st, user_input)
+                self.vacancies_count += 1
 
 
 class Vacancy:
+    __slots__ = ('name', 'salary', 'area_name', 'published_at')
+
     def __init__(self, vacancy_data, st, user_input):
-        vacancy_data = [self.clean_value(s.split('\n')) for s in vacancy_data]
+        # От html тегов и лишних пробелов очищаются только текстовые поля, оклад, валюта и дата берутся как есть.
         i, c = 0, 0
         if len(vacancy_data) > 6:
             i, c = 5, 6
-        self.name = vacancy_data[0]
+        self.name = self.clean_field(vacancy_data[0])
         self.salary = Salary(vacancy_data[i + 1],
                              vacancy_data[i + 2],
                              vacancy_data[c + 3])
-        self.area_name = vacancy_data[c + 4]
+        self.area_name = self.clean_field(vacancy_data[c + 4])
         self.published_at = self.date_format(vacancy_data[c + 5])
 
         st.add_data(self, user_input)
@@ -94,33 +118,32 @@ class Vacancy:
 
     @staticmethod
     def date_format(date):
-        class dotdict(dict):  # Для получения значения через точку.
-            """dot.notation access to dictionary attributes"""
-            __getattr__ = dict.get
-            __setattr__ = dict.__setitem__
-            __delattr__ = dict.__delitem__
-
-        return dotdict({'year': date[0:4]})  # Для статистики нужен только год.
+        return parse_month(date[:7])  # Для статистики нужны только год и месяц.
 
     # @staticmethod
     # def date_format(date):
     #     return pd.to_datetime(date)
 
+    @staticmethod
+    def clean_field(value):
+        # Уже чистое значение возвращается как есть, без разбиения на строки и замен.
+        if clean_value_pattern.fullmatch(value):
+            return value
+        return Vacancy.clean_value(value.split('\n'))
+
     @staticmethod
     def clean_value(strings):
-        html_tag_pattern = re.compile('<.*?>')
         result = []
         for string in strings:
-            string = re.sub(html_tag_pattern, '', string)
-            string = ' '.join(string.split())
-            string = string.strip()
-            result.append(string)
+            result.append(' '.join(html_tag_pattern.sub('', string).split()))
         if len(result) == 1:
             return result[0]
         return result
 
 
 class Salary:
+    __slots__ = ('salary_from', 'salary_to', 'salary_currency', 'average_salary')
+
     def __init__(self, salary_from, salary_to, salary_currency):
         self.salary_from = float(salary_from)
         self.salary_to = float(salary_to)
@@ -158,11 +181,11 @@ class Statistics:
         self.year_to_salary_for_job = {k: self.average(k, v, self.year_to_vac_num_for_job) for k, v in self.year_to_salary_for_job.items()}
 
         area_salary_cut = {k: v for k, v in self.area_to_salary.items() if
-                           self.area_to_vac_num[k] >= int(len(data_set.vacancies_objects) * 0.01)}
+                           self.area_to_vac_num[k] >= int(data_set.vacancies_count * 0.01)}
         self.sorted_area_salary = dict(sorted(area_salary_cut.items(), key=lambda i: i[1], reverse=True)[:10])
 
-        area_num_cut = {k: round(v / len(data_set.vacancies_objects), 4) for k, v in self.area_to_vac_num.items() if
-                        self.area_to_vac_num[k] >= int(len(data_set.vacancies_objects) * 0.01)}
+        area_num_cut = {k: round(v / data_set.vacancies_count, 4) for k, v in self.area_to_vac_num.items() if
+                        self.area_to_vac_num[k] >= int(data_set.vacancies_count * 0.01)}
         self.sorted_area_num = dict(sorted(area_num_cut.items(), key=lambda i: i[1], reverse=True)[:10])
 
     @staticmethod
@@ -29,6 +29,9 @@ currency_to_rub = {
     "UZS": 0.0055,
 }
 
+html_tag_pattern = re.compile('<.*?>')
+clean_value_pattern = re.compile(r'[^<\s]+(?: [^<\s]+)*')  # Значение без тегов, переносов и лишних пробелов.
+
 
 class UserInput:
     """
@@ -56,8 +59,8 @@ class DataSet:
     Attributes:
         file_name (str): Название файла
         csv_headers ([str]): Массив заголовков
-        read_data ([str]): Массив строк с данными
-        vacancies_objects ([Vacancy]): Массив обработанных данных класса Vacancy
+        read_data (Iterator[List[str]]): Итератор по строкам с данными
+        vacancies_count (int): Количество обработанных вакансий
     """
     def __init__(self, st, user_input):
         """
@@ -69,7 +72,7 @@ class DataSet:
         """
         self.file_name = user_input.file_name
         self.csv_headers, self.read_data = self.csv_reader()
-        self.vacancies_objects = []
+        self.vacancies_count = 0
         self.csv_filter(st, user_input)
 
     def csv_reader(self):
@@ -77,27 +80,47 @@ class DataSet:
         Производит чтение данных из файла. Проверяет пустоту файла.
 
         Returns:
-            List[Union[List[str], List[List[str]]]]: Список заголовков и список данных
+            List[Union[List[str], Iterator[List[str]]]]: Список заголовков и итератор по строкам данных
         """
         vacancies_file = open(self.file_name, encoding='utf_8_sig')
         vacancies_reader = csv.reader(vacancies_file)
-        file_len = len(vacancies_file.readlines())
-        if file_len == 0:
+        csv_headers = next(vacancies_reader, None)
+        if csv_headers is None:
+            vacancies_file.close()
             print("Пустой файл")
             sys.exit()
-        elif file_len == 1:
+        first_row = next(vacancies_reader, None)
+        if first_row is None:
+            vacancies_file.close()
             print("Нет данных")
             sys.exit()
-        vacancies_file.seek(0)
-        return [vacancies_reader.__next__(), [x for x in vacancies_reader]]
+        return [csv_headers, self.read_rows(vacancies_file, vacancies_reader, first_row)]
+
+    @staticmethod
+    def read_rows(vacancies_file, vacancies_reader, first_row):
+        """
+        Построчно отдает данные из файла, не загружая файл в память целиком. Закрывает файл по окончании чтения.
+
+        Args:
+            vacancies_file (TextIO): Открытый файл с данными
+            vacancies_reader (csv.reader): Объект для чтения строк файла
+            first_row ([str]): Первая строка данных, прочитанная при проверке файла
+
+        Returns:
+            Iterator[List[str]]: Итератор по строкам данных
+        """
+        with vacancies_file:
+            yield first_row
+            yield from vacancies_reader
 
     def csv_filter(self, st, user_input):
         """
-        Обрабатывает строки данных переводя их в класс Vacancy
+        Обрабатывает строки данных переводя их в класс Vacancy. Вакансии сразу попадают в статистику и не хранятся.
         """
         for vacancy_data in self.read_data:
             if len(vacancy_data) == len(self.csv_headers) and vacancy_data.count('') == 0:
-                self.vacancies_objects.append(Vacancy(vacancy_data, st, user_input))
+                Vacancy(vacancy_data, st, user_input)
+                self.vacancies_count += 1
 
 
 class Vacancy:
@@ -110,6 +133,8 @@ class Vacancy:
         area_name (str): Название региона.
         published_at (datetime): Дата публикации.
     """
+    __slots__ = ('name', 'salary', 'area_name', 'published_at')
+
     def __init__(self, vacancy_data, st, user_input):
         """
         Инициализирует объект Vacancy. Заполняет поля вакансии. Добавляет данные вакансии в статистику.
@@ -128,19 +153,42 @@ class Vacancy:
             >>> Vacancy(['IT аналитик', '35000.0', '45000.0', 'RUR', 'Санкт-Петербург', '2007-12-03T17:34:36+0300'], Statistics(), UserInput()).published_at.timestamp()
             1196692476.0
         """
-        vacancy_data = [self.clean_value(s.split('\n')) for s in vacancy_data]
+        # От html тегов и лишних пробелов очищаются только текстовые поля, оклад, валюта и дата берутся как есть.
         i, c = 0, 0
         if len(vacancy_data) > 6:
             i, c = 5, 6
-        self.name = vacancy_data[0]
+        self.name = self.clean_field(vacancy_data[0])
         self.salary = Salary(vacancy_data[i + 1],
                              vacancy_data[i + 2],
                              vacancy_data[c + 3])
-        self.area_name = vacancy_data[c + 4]
+        self.area_name = self.clean_field(vacancy_data[c + 4])
         self.published_at = datetime.strptime(vacancy_data[c + 5], "%Y-%m-%dT%H:%M:%S%z")
 
         st.add_data(self, user_input)
 
+    @staticmethod
+    def clean_field(value):
+        """
+        Очищает текстовое поле. Значение без html тегов, переносов строк и лишних пробелов
+        возвращается как есть, иначе очищается каждая его строка.
+
+        Args:
+            value (str): Значение поля из файла.
+
+        Returns:
+            str or List[str]: Очищенное значение
+
+            >>> Vacancy.clean_field('IT аналитик')
+            'IT аналитик'
+            >>> Vacancy.clean_field('<p> IT  аналитик </p>')
+            'IT аналитик'
+            >>> Vacancy.clean_field('Python\\n <b>SQL</b>')
+            ['Python', 'SQL']
+        """
+        if clean_value_pattern.fullmatch(value):
+            return value
+        return Vacancy.clean_value(value.split('\n'))
+
     @staticmethod
     def clean_value(strings):
         """
@@ -161,13 +209,9 @@ class Vacancy:
             >>> Vacancy.clean_value(['<p> IT аналитик </p>'])
             'IT аналитик'
         """
-        html_tag_pattern = re.compile('<.*?>')
         result = []
         for string in strings:
-            string = re.sub(html_tag_pattern, '', string)
-            string = ' '.join(string.split())
-            string = string.strip()
-            result.append(string)
+            result.append(' '.join(html_tag_pattern.sub('', string).split()))
         if len(result) == 1:
             return result[0]
         return result
@@ -183,6 +227,8 @@ class Salary:
         salary_currency (str): Валюта оклада
         average_salary (int or float): Средняя зарплата в рублях
     """
+    __slots__ = ('salary_from', 'salary_to', 'salary_currency', 'average_salary')
+
     def __init__(self, salary_from, salary_to, salary_currency):
         """
         Инициализирует объект Salary. Конвертирует числа. Считает среднюю зарплату.
@@ -214,28 +260,38 @@ class Salary:
 
 class Statistics:
     """
-    Класс для подсчета статистики.
+    Класс для подсчета статистики. Хранит суммы и количества, поэтому частичные статистики
+    по разным частям данных можно объединить через merge и затем посчитать итог через finalize.
 
     Attributes:
-        year_to_salary (dict): Статистика зарплат по годам
+        year_to_salary_sum (dict): Сумма зарплат по годам
         year_to_vac_num (dict): Статистика количества вакансий по годам
-        year_to_salary_for_job (dict): Статистика зарплат по годам для выбранной профессии
+        year_to_salary_for_job_sum (dict): Сумма зарплат по годам для выбранной профессии
         year_to_vac_num_for_job (dict): Статистика количества вакансий по годам для выбранной профессии
-        area_to_salary (dict): Статистика зарплат по регионам
+        area_to_salary_sum (dict): Сумма зарплат по регионам
         area_to_vac_num (dict): Статистика количества вакансий по регионам
+        year_to_salary (dict): Статистика зарплат по годам
+        year_to_salary_for_job (dict): Статистика зарплат по годам для выбранной профессии
+        area_to_salary (dict): Статистика зарплат по регионам
         sorted_area_salary (dict): Отсортированная статистика зарплат по регионам
         sorted_area_num (dict): Отсортированная статистика количества вакансий по регионам
     """
+    sums = ['year_to_salary_sum', 'year_to_vac_num', 'year_to_salary_for_job_sum', 'year_to_vac_num_for_job',
+            'area_to_salary_sum', 'area_to_vac_num']
+
     def __init__(self):
         """
         Инициализирует объект Statistics.
         """
-        self.year_to_salary = {}
+        self.year_to_salary_sum = {}
         self.year_to_vac_num = {}
-        self.year_to_salary_for_job = {}
+        self.year_to_salary_for_job_sum = {}
         self.year_to_vac_num_for_job = {}
-        self.area_to_salary = {}
+        self.area_to_salary_sum = {}
         self.area_to_vac_num = {}
+        self.year_to_salary = {}
+        self.year_to_salary_for_job = {}
+        self.area_to_salary = {}
         self.sorted_area_salary = {}
         self.sorted_area_num = {}
 
@@ -247,34 +303,51 @@ class Statistics:
             vacancy (Vacancy): Объект класса Vacancy. Представляет данные о вакансии
             user_input (UserInput): Объект класса UserInput. Представляет данные о введенных данных
         """
-        self.year_to_salary[vacancy.published_at.year] = self.year_to_salary.setdefault(vacancy.published_at.year, 0) + vacancy.salary.average_salary
-        self.year_to_vac_num[vacancy.published_at.year] = self.year_to_vac_num.setdefault(vacancy.published_at.year, 0) + 1
-        self.area_to_salary[vacancy.area_name] = self.area_to_salary.setdefault(vacancy.area_name, 0) + vacancy.salary.average_salary
+        year = vacancy.published_at.year
+        self.year_to_salary_sum[year] = self.year_to_salary_sum.setdefault(year, 0) + vacancy.salary.average_salary
+        self.year_to_vac_num[year] = self.year_to_vac_num.setdefault(year, 0) + 1
+        self.area_to_salary_sum[vacancy.area_name] = self.area_to_salary_sum.setdefault(vacancy.area_name, 0) + vacancy.salary.average_salary
         self.area_to_vac_num[vacancy.area_name] = self.area_to_vac_num.setdefault(vacancy.area_name, 0) + 1
         if user_input.job_name.lower() in vacancy.name.lower():
-            self.year_to_salary_for_job[vacancy.published_at.year] = self.year_to_salary_for_job.setdefault(vacancy.published_at.year, 0) + vacancy.salary.average_salary
-            self.year_to_vac_num_for_job[vacancy.published_at.year] = self.year_to_vac_num_for_job.setdefault(vacancy.published_at.year, 0) + 1
+            self.year_to_salary_for_job_sum[year] = self.year_to_salary_for_job_sum.setdefault(year, 0) + vacancy.salary.average_salary
+            self.year_to_vac_num_for_job[year] = self.year_to_vac_num_for_job.setdefault(year, 0) + 1
         else:
-            self.year_to_salary_for_job[vacancy.published_at.year] = self.year_to_salary_for_job.setdefault(vacancy.published_at.year, 0)
-            self.year_to_vac_num_for_job[vacancy.published_at.year] = self.year_to_vac_num_for_job.setdefault(vacancy.published_at.year, 0)
+            self.year_to_salary_for_job_sum.setdefault(year, 0)
+            self.year_to_vac_num_for_job.setdefault(year, 0)
 
-    def calc_average(self, data_set):
+    def merge(self, other):
         """
-        Считает средние значения в целевых статистиках. Сортирует данные.
+        Добавляет к статистике суммы и количества из другой статистики.
 
         Args:
-            data_set (DataSet): Объект класса DataSet. Представляет данные для анализа.
+            other (Statistics): Объект класса Statistics, посчитанный по другой части данных.
+
+        Returns:
+            Statistics: Текущий объект с объединенными данными.
+        """
+        for name in self.sums:
+            data = getattr(self, name)
+            for key, value in getattr(other, name).items():
+                data[key] = data.get(key, 0) + value
+        return self
+
+    def finalize(self):
+        """
+        Считает средние значения в целевых статистиках. Сортирует данные. Суммы и количества не изменяются.
         """
-        self.year_to_salary = {k: self.average(k, v, self.year_to_vac_num) for k, v in self.year_to_salary.items()}
-        self.area_to_salary = {k: self.average(k, v, self.area_to_vac_num) for k, v in self.area_to_salary.items()}
-        self.year_to_salary_for_job = {k: self.average(k, v, self.year_to_vac_num_for_job) for k, v in self.year_to_salary_for_job.items()}
+        vacancies_count = sum(self.year_to_vac_num.values())
+        self.year_to_vac_num = dict(sorted(self.year_to_vac_num.items()))
+        self.year_to_vac_num_for_job = dict(sorted(self.year_to_vac_num_for_job.items()))
+        self.year_to_salary = {k: self.average(k, v, self.year_to_vac_num) for k, v in sorted(self.year_to_salary_sum.items())}
+        self.area_to_salary = {k: self.average(k, v, self.area_to_vac_num) for k, v in self.area_to_salary_sum.items()}
+        self.year_to_salary_for_job = {k: self.average(k, v, self.year_to_vac_num_for_job) for k, v in sorted(self.year_to_salary_for_job_sum.items())}
 
         area_salary_cut = {k: v for k, v in self.area_to_salary.items() if
-                           self.area_to_vac_num[k] >= int(len(data_set.vacancies_objects) * 0.01)}
+                           self.area_to_vac_num[k] >= int(vacancies_count * 0.01)}
         self.sorted_area_salary = dict(sorted(area_salary_cut.items(), key=lambda i: i[1], reverse=True)[:10])
 
-        area_num_cut = {k: round(v / len(data_set.vacancies_objects), 4) for k, v in self.area_to_vac_num.items() if
-                        self.area_to_vac_num[k] >= int(len(data_set.vacancies_objects) * 0.01)}
+        area_num_cut = {k: round(v / vacancies_count, 4) for k, v in self.area_to_vac_num.items() if
+                        self.area_to_vac_num[k] >= int(vacancies_count * 0.01)}
         self.sorted_area_num = dict(sorted(area_num_cut.items(), key=lambda i: i[1], reverse=True)[:10])
 
     @staticmethod
@@ -489,7 +562,7 @@ def main():
     user_input = UserInput()
     st = Statistics()
     data_set = DataSet(st, user_input)
-    st.calc_average(data_set)
+    st.finalize()
     rep = Report(user_input)
     rep.generate_pdf(st, user_input)
 
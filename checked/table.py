@@ -1,9 +1,12 @@
-import copy
 import csv
+import heapq
+import json
 import math
+import os
 import re
 import sys
 import prettytable
+from array import array
 from datetime import datetime
 from prettytable import PrettyTable
 
@@ -36,6 +39,8 @@ rus_salary_currency = {
     "USD": "Доллары",
     "UZS": "Узбекский сум",
 }
+field_names = {value: key for key, value in dic_naming.items()}
+experience_rank = {key: rank for rank, key in enumerate(rus_experience_id)}
 currency_to_rub = {
     "AZN": 35.68,
     "BYR": 23.91,
@@ -49,6 +54,16 @@ currency_to_rub = {
     "UZS": 0.0055,
 }
 
+html_tag_pattern = re.compile('<.*?>')
+clean_value_pattern = re.compile(r'[^<\s]+(?: [^<\s]+)*')  # Значение без тегов, переносов и лишних пробелов.
+filter_date_pattern = re.compile(r'(\d{2})\.(\d{2})\.(\d{4})')
+text_columns = {'Название': 0, 'Компания': 5, 'Название региона': 10}
+index_columns = {'Название региона': 10, 'Компания': 5, 'Опыт работы': 3, 'Идентификатор валюты оклада': 9, 'Навыки': 2}
+index_version = 3
+table_columns = ['№'] + list(dic_naming.values())
+output_formats = ['Таблица', 'CSV', 'JSON']
+page_size = 20
+
 
 class UserInput:
     def __init__(self):
@@ -58,6 +73,7 @@ class UserInput:
         self.reverse_sort = input('Обратный порядок сортировки (Да / Нет): ')
         self.start_end = input('Введите диапазон вывода: ').split()
         self.fields = ['№'] + input('Введите требуемые столбцы: ').split(', ')
+        self.output_format = optional_input('Формат вывода (Таблица / CSV / JSON): ')
 
         # self.file_name = 'vacancies_medium2.csv'
         # self.filter_param = 'Опыт работы: От 3 до 6 лет'.split(': ')
@@ -68,6 +84,7 @@ class UserInput:
 
         self.check_filter_param()
         self.check_sort_param()
+        self.check_output_format()
 
     def check_filter_param(self):
         if len(self.filter_param) == 1 and self.filter_param[0] == '':
@@ -82,7 +99,7 @@ class UserInput:
     def check_sort_param(self):
         if self.sort_param == '':
             self.sort_param = 'Не сортировать'
-        elif self.sort_param not in dic_naming.values():
+        elif any(field not in dic_naming.values() for field in self.sort_param.split(', ')):
             print('Параметр сортировки некорректен')
             sys.exit()
         elif self.reverse_sort not in ['Да', 'Нет', '']:
@@ -93,6 +110,13 @@ class UserInput:
         else:
             self.reverse_sort = bool_convert(self.reverse_sort)
 
+    def check_output_format(self):
+        if self.output_format == '':
+            self.output_format = 'Таблица'
+        elif self.output_format not in output_formats:
+            print('Формат вывода некорректен')
+            sys.exit()
+
     def check_cut_params(self, counter):
         if len(self.start_end) == 0:
             self.start_end.extend([0, counter])
@@ -108,105 +132,248 @@ class UserInput:
 class DataSet:
     def __init__(self, user_input):
         self.file_name = user_input.file_name
-        self.csv_headers, self.readed_data = self.csv_reader()
-        self.vacancies_objects = []
-        self.csv_filter()
+        self.csv_reader()
+        self.index = TableIndex(self.file_name)
+        self.rows = self.index.filter_rows(user_input.filter_param)
 
     def csv_reader(self):
-        vacancies_file = open(self.file_name, encoding='utf_8_sig')
-        vacancies_reader = csv.reader(vacancies_file)
-        file_len = len(vacancies_file.readlines())
-        if file_len == 0:
-            print("Пустой файл")
-            sys.exit()
-        elif file_len == 1:
-            print("Нет данных")
-            sys.exit()
-        vacancies_file.seek(0)
-        return [vacancies_reader.__next__(), [x for x in vacancies_reader]]
-
-    def csv_filter(self):
-        for vacancy_data in self.readed_data:
-            if len(vacancy_data) == len(self.csv_headers) and vacancy_data.count('') == 0:
-                self.vacancies_objects.append(Vacancy(vacancy_data))
+        with open(self.file_name, encoding='utf_8_sig') as vacancies_file:
+            vacancies_reader = csv.reader(vacancies_file)
+            if next(vacancies_reader, None) is None:
+                print("Пустой файл")
+                sys.exit()
+            if next(vacancies_reader, None) is None:
+                print("Нет данных")
+                sys.exit()
 
     def print_table(self, user_input):
-        counter = 0
-        table = PrettyTable(['№'] + list(dic_naming.values()), align='l', hrules=prettytable.ALL, max_width=20)
-        print_data = []
-
-        for vacancy in self.vacancies_objects:
-            formatted_vacancy = copy.deepcopy(vacancy)
-            formatted_data = formatted_vacancy.formatter()
-            if formatted_data.vacancy_filter(user_input.filter_param, vacancy):
-                counter += 1
-                print_data.append([counter] + list(formatted_data.values()) + [vacancy])
-        self.sort_data(print_data, table, user_input)
-        if counter == 0:
+        # Строки отбираются и сортируются по индексу, из CSV читаются и русифицируются только строки
+        # из диапазона вывода, по page_size за раз. Каждая страница выводится сразу после чтения.
+        rows = self.rows
+        if len(rows) == 0:
             print('Ничего не найдено')
             sys.exit()
-        user_input.check_cut_params(counter)
-        print(table.get_string(start=user_input.start_end[0], end=user_input.start_end[1], fields=user_input.fields))
+        user_input.check_cut_params(len(rows))
+        start, end = (max(int(value), 0) for value in user_input.start_end)
+        rows = self.sort_data(rows, user_input, self.index.sort_key, end)
+        numbers = range(len(rows))[start:end]
+        fields = [field for field in table_columns if field in user_input.fields]
+        writer = csv.writer(sys.stdout, lineterminator='\n')
+        if user_input.output_format == 'CSV':
+            writer.writerow(fields)
+        pages = [numbers[i:i + page_size] for i in range(0, len(numbers), page_size)] or [numbers]
+        for page in pages:
+            vacancies = self.index.vacancies([rows[i] for i in page])
+            if user_input.output_format == 'Таблица':
+                print(self.table_page(page, vacancies, user_input.fields))
+            else:
+                for i, vacancy in zip(page, vacancies):
+                    values = [join_lines(value) for value in vacancy.formatter(cut=False).values()]
+                    values = dict(zip(table_columns, [i + 1] + values))
+                    if user_input.output_format == 'CSV':
+                        writer.writerow([values[field] for field in fields])
+                    else:
+                        print(json.dumps({field: values[field] for field in fields}, ensure_ascii=False))
+            sys.stdout.flush()
+
+    @staticmethod
+    def table_page(numbers, vacancies, fields):
+        # Ширина столбцов считается только по строкам страницы.
+        table = PrettyTable(table_columns, align='l', hrules=prettytable.ALL, max_width=20)
+        for i, vacancy in zip(numbers, vacancies):
+            table.add_row([i + 1] + vacancy.formatter().values())
+        return table.get_string(fields=fields)
+
+    @staticmethod
+    def sort_data(rows, user_input, sort_key, limit=None):
+        # Параметров сортировки может быть несколько через запятую. Если нужны только первые limit строк
+        # и их намного меньше, чем всего, они выбираются через heapq в том же порядке, что дал бы sorted().
+        if user_input.sort_param == 'Не сортировать':
+            return rows
+        fields = user_input.sort_param.split(', ')
+        if len(fields) == 1:
+            key = lambda row: sort_key(row, fields[0])
+        else:
+            key = lambda row: tuple(sort_key(row, field) for field in fields)
+        reverse_sort = user_input.reverse_sort and fields != ['Опыт работы']  # Опыт всегда по возрастанию.
+        if limit is not None and limit * 4 < len(rows):
+            return (heapq.nlargest if reverse_sort else heapq.nsmallest)(limit, rows, key=key)
+        return sorted(rows, key=key, reverse=reverse_sort)
+
+
+class TableIndex:
+    # Индекс лежит рядом с CSV в файле <имя>.index и строится один раз: смещения подходящих строк в байтах,
+    # ранги Vacancy.sort_key по каждому столбцу (равные ключи - равные ранги, поэтому порядок сортировки
+    # тот же) и списки номеров строк по значениям региона, компании, опыта, валюты и навыков.
+    # Если у CSV изменились размер или время изменения, индекс собирается заново.
+    def __init__(self, file_name):
+        self.file_name = file_name
+        self.index_name = file_name + '.index'
+        stat = os.stat(file_name)
+        self.stamp = (index_version, stat.st_size, stat.st_mtime_ns)
+        if not self.load():
+            self.build()
+            self.save()
+
+    def load(self):
+        # Индекс хранится строкой JSON с описанием и следующими за ней массивами array, поэтому при чтении
+        # не выполняется никакой код. Любая ошибка чтения или несоответствие описания - повод собрать индекс заново.
+        try:
+            with open(self.index_name, 'rb') as index_file:
+                header = json.loads(index_file.readline())
+                if header['stamp'] != list(self.stamp):
+                    return False
+                count = header['count']
+                offsets = read_array(index_file, 'q', count, self.stamp[1])
+                ranks = {field: read_array(index_file, 'i', count, count) for field in dic_naming.values()}
+                lists = {field: self.read_lists(index_file, header['lists'][field], count) for field in index_columns}
+                if index_file.read(1):
+                    return False
+        except (OSError, EOFError, ValueError, KeyError, TypeError, AttributeError):
+            return False
+        self.offsets, self.ranks, self.lists = offsets, ranks, lists
+        return True
 
     @staticmethod
-    def sort_data(print_data, table, user_input):
-        sort_param = user_input.sort_param
-        reverse_sort = user_input.reverse_sort
-        if sort_param == 'Не сортировать':
-            table.add_rows([x[:-1] for x in print_data])
-            return
-        if sort_param in ['Название', 'Описание', 'Премиум-вакансия', 'Компания', 'Название региона']:
-            print_data = sorted(print_data,
-                                key=lambda l: str(l[list(dic_naming.values()).index(sort_param) + 1]),
-                                reverse=reverse_sort)
-        elif sort_param == 'Оклад':
-            print_data = sorted(print_data,
-                                key=lambda l: l[-1].salary.average_salary * currency_to_rub[
-                                    l[-1].salary.salary_currency],
-                                reverse=reverse_sort)
-        elif sort_param == 'Навыки':
-            print_data = sorted(print_data, key=lambda l: l[-1].skills_count, reverse=reverse_sort)
-        elif sort_param == 'Дата публикации вакансии':
-            print_data = sorted(print_data, key=lambda l: l[-1].published_at, reverse=reverse_sort)
-        elif sort_param == 'Опыт работы':
-            print_data = sorted(print_data, key=lambda l: list(rus_experience_id.values()).index(l[4]))
-
-        for i in range(1, len(print_data) + 1):
-            print_data[i - 1][0] = i
-        table.add_rows([x[:-1] for x in print_data])
+    def read_lists(index_file, values, count):
+        # Списки строк одного столбца записаны подряд, их значения и длины - в описании.
+        if any(type(length) != int or length < 0 for _, length in values):
+            raise ValueError('Некорректная длина списка')
+        numbers = read_array(index_file, 'i', sum(length for _, length in values), count)
+        lists = {}
+        start = 0
+        for value, length in values:
+            lists[value] = numbers[start:start + length]
+            start += length
+        return lists
+
+    def save(self):
+        # Если рядом с CSV писать нельзя, индекс используется только в этом запуске.
+        lists = {field: [[value, len(numbers)] for value, numbers in self.lists[field].items()] for field in index_columns}
+        header = {'stamp': self.stamp, 'count': len(self.offsets), 'lists': lists}
+        try:
+            with open(self.index_name, 'wb') as index_file:
+                index_file.write(json.dumps(header).encode() + b'\n')
+                self.offsets.tofile(index_file)
+                for field in dic_naming.values():
+                    self.ranks[field].tofile(index_file)
+                for field in index_columns:
+                    for numbers in self.lists[field].values():
+                        numbers.tofile(index_file)
+        except OSError:
+            pass
+
+    def build(self):
+        # От каждой вакансии остаются только ключи сортировки (строковые обрезаны, как при выводе),
+        # сами вакансии не хранятся.
+        self.offsets = array('q')
+        self.lists = {field: {} for field in index_columns}
+        keys = {field: [] for field in dic_naming.values()}
+        for offset, vacancy_data in self.scan():
+            for field, column in index_columns.items():
+                for value in self.index_values(field, vacancy_data[column]):
+                    self.lists[field].setdefault(value, array('i')).append(len(self.offsets))
+            self.offsets.append(offset)
+            vacancy = Vacancy(vacancy_data)
+            for field, field_keys in keys.items():
+                field_keys.append(vacancy.sort_key(field))
+        self.ranks = {field: self.rank(field_keys) for field, field_keys in keys.items()}
+
+    @staticmethod
+    def index_values(field, value):
+        # Значения, по которым compile_filter() сравнивает столбец: очищенный текст, исходный код или навыки.
+        if field == 'Навыки':
+            return skill_set(value)
+        elif field in text_columns:
+            value = cut_value(Vacancy.clean_field(value))
+            return [value] if type(value) == str else []
+        return [value]
+
+    @staticmethod
+    def rank(keys):
+        ranks = {key: rank for rank, key in enumerate(sorted(set(keys)))}
+        return array('i', (ranks[key] for key in keys))
+
+    def scan(self):
+        # Подходящие строки CSV по порядку вместе со смещениями.
+        with open(self.file_name, 'rb') as csv_file:
+            records = read_records(csv_file)
+            _, csv_headers = next(records)
+            for offset, vacancy_data in records:
+                if len(vacancy_data) == len(csv_headers) and vacancy_data.count('') == 0:
+                    yield offset, vacancy_data
+
+    def filter_rows(self, filter_param):
+        # Номера строк, подходящих под фильтр, по порядку файла. Фильтр по столбцу без списков
+        # проверяется compile_filter() по строкам CSV без создания вакансий.
+        if filter_param == 'Нет параметров':
+            return range(len(self.offsets))
+        filter_key, filter_val = filter_param
+        if filter_key not in self.lists:
+            row_filter = compile_filter(filter_param)
+            return [number for number, (_, vacancy_data) in enumerate(self.scan()) if row_filter(vacancy_data)]
+        lists = self.lists[filter_key]
+        if filter_key == 'Навыки':
+            rows = [set(lists.get(skill, [])) for skill in set(filter_val.split(', '))]
+            return sorted(set.intersection(*rows))
+        elif filter_key == 'Опыт работы':
+            keys = [key for key, value in rus_experience_id.items() if value == filter_val]
+        elif filter_key == 'Идентификатор валюты оклада':
+            keys = [key for key, value in rus_salary_currency.items() if value == filter_val]
+        else:
+            keys = [filter_val]
+        return sorted(number for key in keys for number in lists.get(key, []))
+
+    def sort_key(self, number, field):
+        return self.ranks[field][number]
+
+    def vacancies(self, numbers):
+        result = []
+        with open(self.file_name, 'rb') as csv_file:
+            for number in numbers:
+                csv_file.seek(self.offsets[number])
+                _, vacancy_data = next(read_records(csv_file))
+                result.append(Vacancy(vacancy_data))
+        return result
 
 
 class Vacancy:
+    __slots__ = ('name', 'description', 'key_skills', 'skills_count', 'experience_id', 'premium',
+                 'employer_name', 'salary', 'area_name', 'published_at')
+
     def __init__(self, vacancy_data):
-        vacancy_data = [self.clean_value(s.split('\n')) for s in vacancy_data]
-        self.name = vacancy_data[0]
-        self.description = vacancy_data[1]
-        self.key_skills = vacancy_data[2]
+        # От html тегов и лишних пробелов очищаются только текстовые поля, опыт, премиум, оклад и дата берутся как есть.
+        self.name = self.clean_field(vacancy_data[0])
+        self.description = self.clean_field(vacancy_data[1])
+        self.key_skills = self.clean_field(vacancy_data[2])
         self.skills_count = len(self.key_skills) if type(self.key_skills) == list else 1
         self.experience_id = vacancy_data[3]
         self.premium = vacancy_data[4]
-        self.employer_name = vacancy_data[5]
+        self.employer_name = self.clean_field(vacancy_data[5])
         self.salary = Salary(vacancy_data[6],
                              vacancy_data[7],
                              vacancy_data[8],
                              vacancy_data[9])
-        self.area_name = vacancy_data[10]
+        self.area_name = self.clean_field(vacancy_data[10])
         self.published_at = datetime.strptime(vacancy_data[11], "%Y-%m-%dT%H:%M:%S%z")
 
+    @staticmethod
+    def clean_field(value):
+        # Уже чистое значение возвращается как есть, без разбиения на строки и замен.
+        if clean_value_pattern.fullmatch(value):
+            return value
+        return Vacancy.clean_value(value.split('\n'))
+
     @staticmethod
     def clean_value(strings):
-        html_tag_pattern = re.compile('<.*?>')
         result = []
         for string in strings:
-            string = re.sub(html_tag_pattern, '', string)
-            string = ' '.join(string.split())
-            string = string.strip()
-            result.append(string)
+            result.append(' '.join(html_tag_pattern.sub('', string).split()))
         if len(result) == 1:
             return result[0]
         return result
 
-    def formatter(self):
+    def formatter(self, cut=True):
         format_number = lambda val: re.sub("(\d)(?=(\d{3})+(?!\d))", r"\1 ", "%d" % float(val))
 
         self.key_skills = "\n".join(self.key_skills) if type(self.key_skills) == list else self.key_skills
@@ -220,30 +387,33 @@ class Vacancy:
                       f'({self.salary.salary_currency}) ' + \
                       f'({self.salary.salary_gross})'
 
-        for key in dic_naming.keys():
-            attr_val = str(self.__getattribute__(key))
-            if len(attr_val) > 100:
-                self.__setattr__(key, attr_val[:100] + '...')
+        if cut:
+            for key in dic_naming.keys():
+                self.__setattr__(key, cut_value(self.__getattribute__(key)))
         return self
 
-    def vacancy_filter(self, filter_param, vacancy):
-        if filter_param == 'Нет параметров':
-            return True
-        filter_key, filter_val = filter_param
-        if filter_key in ['Название', 'Компания', 'Премиум-вакансия', 'Название региона', 'Опыт работы',
-                          'Дата публикации вакансии']:
-            return filter_val == self.__getattribute__(
-                list(dic_naming.keys())[list(dic_naming.values()).index(filter_key)])
-        elif filter_key == 'Описание':
-            return filter_val == vacancy.description
-        elif filter_key == 'Идентификатор валюты оклада':
-            return filter_val == rus_salary_currency[vacancy.salary.salary_currency]
-        elif filter_key == 'Оклад':
-            return int(vacancy.salary.salary_from) <= int(filter_val) <= int(vacancy.salary.salary_to)
-        elif filter_key == 'Навыки':
-            filter_skills = filter_val.split(', ')
-            return all(lookfor in iter(vacancy.key_skills) for lookfor in iter(filter_skills))
-        return True
+    def display_value(self, field):
+        # Значение столбца field в том виде, в котором его выведет formatter(), без изменения вакансии.
+        if field == 'Премиум-вакансия':
+            value = bool_convert(self.premium)
+        elif field == 'Опыт работы':
+            value = rus_experience_id[self.experience_id]
+        elif field == 'Дата публикации вакансии':
+            value = self.published_at.strftime('%d.%m.%Y')
+        else:
+            value = self.__getattribute__(field_names[field])
+        return cut_value(value)
+
+    def sort_key(self, field):
+        if field == 'Оклад':
+            return self.salary.average_salary * currency_to_rub[self.salary.salary_currency]
+        elif field == 'Навыки':
+            return self.skills_count
+        elif field == 'Дата публикации вакансии':
+            return self.published_at
+        elif field == 'Опыт работы':
+            return experience_rank[self.experience_id]
+        return str(self.display_value(field))
 
     def values(self):
         return [
@@ -260,6 +430,8 @@ class Vacancy:
 
 
 class Salary:
+    __slots__ = ('salary_from', 'salary_to', 'salary_gross', 'salary_currency', 'average_salary')
+
     def __init__(self, salary_from, salary_to, salary_gross, salary_currency):
         self.salary_from = float(salary_from)
         self.salary_to = float(salary_to)
@@ -268,6 +440,92 @@ class Salary:
         self.average_salary = math.floor((self.salary_from + self.salary_to) / 2)
 
 
+def read_records(csv_file):
+    # Записи CSV из бинарного файла вместе со смещением начала каждой; запись может занимать несколько строк.
+    offset = csv_file.tell()
+    consumed = [offset]
+
+    def lines():
+        for line in csv_file:
+            consumed[0] += len(line)
+            yield line.decode('utf_8_sig').replace('\r\n', '\n')
+
+    for record in csv.reader(lines()):
+        yield offset, record
+        offset = consumed[0]
+
+
+def read_array(index_file, typecode, count, limit):
+    # Массив из count чисел от 0 до limit (не включая); ValueError, если в файле что-то другое.
+    values = array(typecode)
+    values.fromfile(index_file, count)
+    if count and (min(values) < 0 or max(values) >= limit):
+        raise ValueError('Значение вне допустимого диапазона')
+    return values
+
+
+def compile_filter(filter_param):
+    # Параметр фильтрации один раз превращается в проверку строки CSV: для категориальных полей - множество
+    # подходящих исходных значений, для даты - префикс в формате файла, для оклада - число, для навыков - множество.
+    # Результат тот же, что при сравнении с отображаемыми значениями вакансии.
+    if filter_param == 'Нет параметров':
+        return lambda row: True
+    filter_key, filter_val = filter_param
+    if filter_key in text_columns:
+        column = text_columns[filter_key]
+        return lambda row: filter_val == cut_value(Vacancy.clean_field(row[column]))
+    elif filter_key == 'Описание':
+        return lambda row: filter_val == Vacancy.clean_field(row[1])
+    elif filter_key == 'Навыки':
+        filter_skills = set(filter_val.split(', '))
+        return lambda row: filter_skills <= skill_set(row[2])
+    elif filter_key == 'Опыт работы':
+        values = {key for key, value in rus_experience_id.items() if value == filter_val}
+        return lambda row: row[3] in values
+    elif filter_key == 'Премиум-вакансия':
+        values = {value for value in ['True', 'False'] if bool_convert(value) == filter_val}
+        return lambda row: row[4] in values
+    elif filter_key == 'Оклад':
+        salary = int(filter_val)
+        return lambda row: int(float(row[6])) <= salary <= int(float(row[7]))
+    elif filter_key == 'Идентификатор валюты оклада':
+        values = {key for key, value in rus_salary_currency.items() if value == filter_val}
+        return lambda row: row[9] in values
+    elif filter_key == 'Дата публикации вакансии':
+        match = filter_date_pattern.fullmatch(filter_val)
+        if match is None:
+            return lambda row: False
+        prefix = f'{match[3]}-{match[2]}-{match[1]}T'
+        return lambda row: row[11].startswith(prefix)
+    return lambda row: True
+
+
+def skill_set(value):
+    # Навыки вакансии множеством; один навык - строка, а не список.
+    skills = Vacancy.clean_field(value)
+    return set(skills) if type(skills) == list else {skills}
+
+
+def join_lines(value):
+    # Многострочное значение (список строк) для CSV и JSON склеивается через перевод строки.
+    return '\n'.join(value) if type(value) == list else value
+
+
+def cut_value(value):
+    attr_val = str(value)
+    if len(attr_val) > 100:
+        return attr_val[:100] + '...'
+    return value
+
+
+def optional_input(prompt):
+    # Если ответы на вопросы закончились (например, переданы скриптом), берется ответ по умолчанию.
+    try:
+        return input(prompt)
+    except EOFError:
+        return ''
+
+
 def bool_convert(data):
     if data == 'True':
         return 'Да'
@@ -49,5 +49,33 @@ class VacancyTests(TestCase):
         self.assertEqual(Vacancy.clean_value(['<p> IT аналитик </p>']), 'IT аналитик')
 
 
+class StatisticsTests(TestCase):
+    vacancies = [['IT аналитик', '35000.0', '45000.0', 'RUR', 'Санкт-Петербург', '2007-12-03T17:34:36+0300'],
+                 ['Программист', '10.0', '20.4', 'USD', 'Москва', '2008-01-10T10:00:00+0300'],
+                 ['Бизнес-аналитик', '50000.0', '70000.0', 'RUR', 'Москва', '2007-05-01T12:00:00+0300']]
+
+    def test_statistics_merge(self):
+        whole = Statistics()
+        for vacancy_data in self.vacancies:
+            Vacancy(vacancy_data, whole, UserInput())
+        first, second = Statistics(), Statistics()
+        Vacancy(self.vacancies[0], first, UserInput())
+        for vacancy_data in self.vacancies[1:]:
+            Vacancy(vacancy_data, second, UserInput())
+        whole.finalize()
+        first.merge(second).finalize()
+        self.assertEqual(first.year_to_salary, whole.year_to_salary)
+        self.assertEqual(first.year_to_vac_num_for_job, whole.year_to_vac_num_for_job)
+        self.assertEqual(first.sorted_area_salary, whole.sorted_area_salary)
+        self.assertEqual(first.sorted_area_num, whole.sorted_area_num)
+
+    def test_statistics_finalize_keeps_sums(self):
+        st = Statistics()
+        Vacancy(self.vacancies[0], st, UserInput())
+        st.finalize()
+        self.assertEqual(st.year_to_salary_sum, {2007: 40000})
+        self.assertEqual(st.year_to_salary, {2007: 40000})
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,68 @@
+import contextlib
+import csv
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import TestCase
+from unittest.mock import patch
+import table_doc
+from table_doc import TableIndex
+
+csv_header = ['name', 'description', 'key_skills', 'experience_id', 'premium', 'employer_name', 'salary_from',
+              'salary_to', 'salary_gross', 'salary_currency', 'area_name', 'published_at']
+csv_rows = [
+    ['Программист', 'Описание', 'Python', 'noExperience', 'False', 'Яндекс', '10000.0', '20000.0', 'True', 'RUR',
+     'Москва', '2022-07-05T18:19:30+0300'],
+    ['Аналитик', 'Первая строка\nВторая строка', 'Python\nSQL', 'between1And3', 'True', 'Сбер', '30000.0', '40000.0',
+     'False', 'RUR', 'Казань', '2022-07-06T18:19:30+0300'],
+    ['Тестировщик', 'Описание', 'Git', 'moreThan6', 'False', 'Яндекс', '50000.0', '60000.0', 'True', 'USD',
+     'Москва', '2022-07-07T18:19:30+0300'],
+]
+
+
+class TableTests(TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.file_name = os.path.join(self.folder, 'vacancies.csv')
+        with open(self.file_name, 'w', encoding='utf_8_sig', newline='') as file:
+            writer = csv.writer(file)
+            writer.writerow(csv_header)
+            writer.writerows(csv_rows)
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def run_table(self, filter_param, fields='', output_format=''):
+        answers = [self.file_name, filter_param, '', '', '', fields, output_format]
+        out = io.StringIO()
+        with patch('builtins.input', side_effect=answers), contextlib.redirect_stdout(out):
+            table_doc.main()
+        return out.getvalue()
+
+    def test_index_single_skill(self):
+        self.assertEqual(sorted(TableIndex(self.file_name).lists['Навыки']), ['Git', 'Python', 'SQL'])
+
+    def test_filter_single_skill(self):
+        output = self.run_table('Навыки: Python', 'Название', 'CSV')
+        self.assertEqual(output.splitlines(), ['№,Название', '1,Программист', '2,Аналитик'])
+
+    def test_filter_skill_letters(self):
+        with self.assertRaises(SystemExit):
+            self.run_table('Навыки: P, y')
+
+    def test_csv_multiline_description(self):
+        output = self.run_table('Название: Аналитик', 'Описание, Навыки', 'CSV')
+        self.assertEqual(list(csv.reader(io.StringIO(output))),
+                         [['№', 'Описание', 'Навыки'], ['1', 'Первая строка\nВторая строка', 'Python\nSQL']])
+
+    def test_json_multiline_description(self):
+        output = self.run_table('Название: Аналитик', 'Описание, Навыки', 'JSON')
+        self.assertEqual([json.loads(line) for line in output.splitlines()],
+                         [{'№': 1, 'Описание': 'Первая строка\nВторая строка', 'Навыки': 'Python\nSQL'}])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,30 @@
+import numpy as np
+import pandas as pd
+import dates
+
+
+def melt_currencies(currencies):
+    # Таблица currencies.csv (date, BYR, EUR, ...) -> курс по ключу (date, currency).
+    rates = currencies.melt(id_vars='date', var_name='currency', value_name='rate')
+    return rates.set_index(['date', 'currency'])['rate'].sort_index()
+
+
+def currencies_to_work(rates):
+    return list(rates.index.get_level_values('currency').unique()) + ['RUR']
+
+
+def get_salary(df, rates):
+    # Аналог построчного get_salary для всего DataFrame сразу:
+    # если одна из границ вилки не указана - берется другая, иначе середина вилки с округлением вниз;
+    # рубли и валюты без курса не пересчитываются, остальные переводятся по курсу месяца публикации.
+    # Если курса за месяц публикации нет, зарплата получается NaN.
+    salary_from = df['salary_from'].to_numpy(dtype=float)
+    salary_to = df['salary_to'].to_numpy(dtype=float)
+    salary = np.where(np.isnan(salary_from), salary_to,
+                      np.where(np.isnan(salary_to), salary_from, np.floor((salary_from + salary_to) / 2)))
+
+    keys = pd.MultiIndex.from_arrays([dates.month_keys(df['published_at']), df['salary_currency']])
+    rate = rates.reindex(keys).to_numpy(dtype=float)
+    foreign = df['salary_currency'].isin(currencies_to_work(rates)[:-1]).to_numpy()
+    salary = np.where(foreign, np.floor(salary * rate), salary)
+    return pd.Series(salary, index=df.index)
@@ -0,0 +1,11 @@
+# Столбец published_at хранит даты в фиксированном формате YYYY-MM-DDThh:mm:ss±hhmm, поэтому год и месяц
+# берутся векторным срезом строк по всему столбцу, без разбора даты и часового пояса в каждой строке.
+
+
+def month_keys(published_at):
+    # Ключ YYYY-MM, по нему ищется курс валют за месяц публикации.
+    return published_at.str.slice(0, 7)
+
+
+def year_keys(published_at):
+    return published_at.str.slice(0, 4).astype(int)
@@ -0,0 +1,141 @@
+import math
+import random
+import threading
+import time
+from datetime import timedelta
+from concurrent.futures import ThreadPoolExecutor
+import requests
+import pandas as pd
+
+hh_url = 'https://api.hh.ru/vacancies'
+columns = ["name", "salary_from", "salary_to", "salary_currency", "area_name", "published_at"]
+hh_cap = 2000
+min_span = timedelta(seconds=1)
+
+
+class TokenBucket:
+    # Не больше rate запросов в секунду в среднем, пачкой - не больше capacity.
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.last_time = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.last_time) * self.rate)
+                self.last_time = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class Harvester:
+    def __init__(self, base_url=hh_url, rate=2, workers=4, retries=5, backoff=1):
+        self.base_url = base_url
+        self.bucket = TokenBucket(rate, max(1, rate))
+        self.workers = workers
+        self.retries = retries
+        self.backoff = backoff
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.requests_count = 0
+        self.windows = []
+        self.truncated = []
+        self.found = 0
+        self.received = 0
+
+    def session(self):
+        if not hasattr(self.local, 'session'):
+            self.local.session = requests.Session()
+        return self.local.session
+
+    def get(self, params):
+        # На 429 и 5xx запрос повторяется с экспоненциальной задержкой (или по Retry-After).
+        for attempt in range(self.retries + 1):
+            self.bucket.acquire()
+            response = self.session().get(self.base_url, params=params, timeout=30)
+            with self.lock:
+                self.requests_count += 1
+            if response.status_code != 429 and response.status_code < 500 or attempt == self.retries:
+                response.raise_for_status()
+                return response.json()
+            retry_after = response.headers.get('Retry-After')
+            delay = float(retry_after) if retry_after and retry_after.isdigit() else self.backoff * 2 ** attempt
+            time.sleep(delay + random.uniform(0, self.backoff))
+
+    @staticmethod
+    def window_params(window, page):
+        date_from, date_to = window
+        return {'date_from': date_from.strftime('%Y-%m-%dT%H:%M:%S'), 'date_to': date_to.strftime('%Y-%m-%dT%H:%M:%S'),
+                'specialization': 1, 'per_page': 100, 'page': page}
+
+    @staticmethod
+    def split_window(window, parts):
+        date_from, date_to = window
+        step = (date_to - date_from) / parts
+        bounds = sorted({(date_from + step * i).replace(microsecond=0) for i in range(parts)} | {date_to})
+        return list(zip(bounds, bounds[1:]))
+
+    def split_windows(self, executor, windows):
+        # API отдает не больше hh_cap вакансий на запрос с одними параметрами, поэтому окно, в котором
+        # найдено больше, делится на ceil(found / hh_cap) (не меньше двух) равных частей, и части снова
+        # проверяются первой страницей. Тихие промежутки так и остаются одним большим окном.
+        # Проверки одного уровня идут параллельно, первая страница принятого окна потом переиспользуется.
+        accepted = []
+        self.truncated = []
+        self.found = None
+        while windows:
+            first_pages = list(executor.map(lambda window: self.get(self.window_params(window, 0)), windows))
+            if self.found is None:
+                self.found = sum(first_page['found'] for first_page in first_pages)
+            next_windows = []
+            for window, first_page in zip(windows, first_pages):
+                if first_page['found'] <= hh_cap or window[1] - window[0] <= min_span:
+                    if first_page['found'] > hh_cap:
+                        self.truncated.append(window)
+                    accepted.append((window, first_page))
+                else:
+                    next_windows.extend(self.split_window(window, max(2, math.ceil(first_page['found'] / hh_cap))))
+            windows = next_windows
+        return sorted(accepted, key=lambda item: item[0])
+
+    def harvest(self, windows):
+        # Строки копятся в списках и превращаются в DataFrame один раз в конце. Соседние окна делят
+        # границу, поэтому вакансии с уже встреченным id пропускаются.
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            first_pages = self.split_windows(executor, windows)
+            tasks = [(window, page) for window, first_page in first_pages for page in range(1, first_page['pages'])]
+            other_pages = dict(zip(tasks, executor.map(lambda task: self.get(self.window_params(*task)), tasks)))
+
+        self.windows = [window for window, _ in first_pages]
+        seen = set()
+        rows = []
+        for window, first_page in first_pages:
+            pages = [first_page] + [other_pages[(window, page)] for page in range(1, first_page['pages'])]
+            for vacancy in (vacancy for page in pages for vacancy in page['items']):
+                if vacancy['id'] in seen:
+                    continue
+                seen.add(vacancy['id'])
+                if vacancy.get("salary") is None:
+                    continue
+                rows.append([vacancy["name"], vacancy["salary"]["from"], vacancy["salary"]["to"],
+                             vacancy["salary"]["currency"], vacancy["area"]["name"], vacancy["published_at"]])
+        self.received = len(seen)
+        return pd.DataFrame(rows, columns=columns)
+
+    def report(self):
+        coverage = self.received / self.found if self.found else 1
+        return (f'Окон: {len(self.windows)}, запросов: {self.requests_count}, найдено: {self.found}, '
+                f'получено: {self.received} ({coverage:.1%}), окон с обрезанной выдачей: {len(self.truncated)}')
+
+
+def month_window(today):
+    # Весь текущий месяц до конца сегодняшнего дня одним окном, включая выходные.
+    return [(today.replace(day=1, hour=0, minute=0, second=0, microsecond=0),
+             today.replace(hour=23, minute=59, second=59, microsecond=0))]
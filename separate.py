@@ -1,15 +1,80 @@
+import csv
+import hashlib
+import json
 import os
 import pandas as pd
+import dates
 
-def main(file_name, folder_name):
-    new_path = fr'./{folder_name}'
-    if not os.path.exists(new_path):
-        os.makedirs(new_path)
+state_file_name = '.separate_state.json'
+fingerprint_blocks = 64
+fingerprint_block_size = 1 << 12
 
-    df = pd.read_csv(file_name)
-    df['year'] = df['published_at'].apply(lambda x: x[0:4])
-    df_group = df.groupby('year')
 
-    for year, data in df_group:
-        data.loc[:, data.columns != 'year'].to_csv(rf'{folder_name}\part_{year}.csv', index=False)
+def read_state(folder_name):
+    state_file = os.path.join(folder_name, state_file_name)
+    if not os.path.exists(state_file):
+        return None
+    with open(state_file, encoding='utf8') as file:
+        return json.load(file)
 
+
+def write_state(folder_name, state):
+    with open(os.path.join(folder_name, state_file_name), 'w', encoding='utf8') as file:
+        json.dump(state, file)
+
+
+def clear_parts(folder_name):
+    for file_name in os.listdir(folder_name):
+        if file_name.startswith('part_') or file_name == state_file_name:
+            os.remove(os.path.join(folder_name, file_name))
+
+
+def prefix_fingerprint(file, offset):
+    # Хэш длины и fingerprint_blocks равномерно разбросанных блоков первых offset байт, включая первый
+    # (с заголовком) и последний. Читается не больше (fingerprint_blocks + 1) блоков, поэтому проверка не зависит
+    # от размера уже обработанной части; небольшой файл при этом покрывается блоками целиком.
+    digest = hashlib.sha256(str(offset).encode())
+    starts = {offset * i // fingerprint_blocks for i in range(fingerprint_blocks)}
+    starts.add(max(offset - fingerprint_block_size, 0))
+    for start in sorted(starts):
+        file.seek(start)
+        digest.update(file.read(min(fingerprint_block_size, offset - start)))
+    return digest.hexdigest()
+
+
+def is_processed_prefix(state, source, file):
+    # Уже обработанная часть - тот же файл не короче прежнего с тем же отпечатком первых offset байт.
+    if state['file_name'] != source or state['offset'] > file.seek(0, os.SEEK_END):
+        return False
+    return state.get('fingerprint') == prefix_fingerprint(file, state['offset'])
+
+
+def main(file_name, folder_name, chunk_size=100000, incremental=False):
+    # Файл читается частями по chunk_size строк, строки каждой части дописываются в part_<год>.csv,
+    # поэтому память не зависит от размера файла. При incremental=True обрабатываются только строки,
+    # дописанные в файл после прошлого запуска. Вместе со смещением хранится отпечаток уже обработанной части
+    # файла: если файл стал короче или обработанная часть переписана, разбиение строится заново.
+    if not os.path.exists(folder_name):
+        os.makedirs(folder_name)
+
+    source = os.path.abspath(file_name)
+    state = read_state(folder_name) if incremental else None
+    with open(file_name, 'rb') as file:
+        if state is None or not is_processed_prefix(state, source, file):
+            clear_parts(folder_name)
+            state = {'file_name': source, 'offset': 0}
+
+        file.seek(0)
+        header = file.readline()
+        columns = next(csv.reader([header.decode('utf_8_sig')]))
+        file.seek(max(state['offset'], len(header)))
+        if file.peek(1):
+            for chunk in pd.read_csv(file, header=None, names=columns, chunksize=chunk_size, encoding='utf8'):
+                chunk['year'] = dates.year_keys(chunk['published_at'])
+                for year, data in chunk.groupby('year'):
+                    part_file = os.path.join(folder_name, f'part_{year}.csv')
+                    data.loc[:, data.columns != 'year'].to_csv(part_file, mode='a', index=False,
+                                                               header=not os.path.exists(part_file))
+        if incremental:
+            end = file.seek(0, os.SEEK_END)
+            write_state(folder_name, {'file_name': source, 'offset': end, 'fingerprint': prefix_fingerprint(file, end)})
@@ -0,0 +1,81 @@
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import TestCase
+import cbr_rates
+
+recorded_xml = '''<?xml version="1.0" encoding="windows-1251"?>
+<ValCurs Date="01.02.2003" name="Foreign Currency Market">
+<Valute ID="R01090"><NumCode>974</NumCode><CharCode>BYR</CharCode><Nominal>1000</Nominal><Name>Белорусских рублей</Name><Value>16,2562</Value></Valute>
+<Valute ID="R01239"><NumCode>978</NumCode><CharCode>EUR</CharCode><Nominal>1</Nominal><Name>Евро</Name><Value>34,4290</Value></Valute>
+<Valute ID="R01335"><NumCode>398</NumCode><CharCode>KZT</CharCode><Nominal>100</Nominal><Name>Тенге</Name><Value>20,5576</Value></Valute>
+<Valute ID="R01720"><NumCode>980</NumCode><CharCode>UAH</CharCode><Nominal>10</Nominal><Name>Гривен</Name><Value>59,4182</Value></Valute>
+<Valute ID="R01235"><NumCode>840</NumCode><CharCode>USD</CharCode><Nominal>1</Nominal><Name>Доллар США</Name><Value>31,8345</Value></Valute>
+</ValCurs>'''.encode('windows-1251')
+
+
+class RecordedCBRHandler(BaseHTTPRequestHandler):
+    requests = []
+
+    def do_GET(self):
+        RecordedCBRHandler.requests.append(self.path)
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/xml; charset=windows-1251')
+        self.send_header('Content-Length', str(len(recorded_xml)))
+        self.end_headers()
+        self.wfile.write(recorded_xml)
+
+    def log_message(self, *args):
+        pass
+
+
+class CBRRatesTests(TestCase):
+    def setUp(self):
+        RecordedCBRHandler.requests = []
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), RecordedCBRHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base_url = f'http://127.0.0.1:{self.server.server_port}/scripts/XML_daily.asp'
+        self.folder = tempfile.mkdtemp()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.folder)
+
+    def test_parse_rates(self):
+        rates = cbr_rates.parse_rates(recorded_xml)
+        self.assertAlmostEqual(rates['BYR'], 0.0162562)
+        self.assertAlmostEqual(rates['KZT'], 0.205576)
+        self.assertAlmostEqual(rates['USD'], 31.8345)
+
+    def test_get_rates(self):
+        df = cbr_rates.get_rates(['2003-02', '2003-03'], self.base_url, self.folder)
+        self.assertEqual(list(df.columns), ['date', 'BYR', 'EUR', 'KZT', 'UAH', 'USD'])
+        self.assertEqual(list(df['date']), ['2003-02', '2003-03'])
+        self.assertAlmostEqual(df['UAH'][0], 5.94182)
+        self.assertEqual(sorted(RecordedCBRHandler.requests), ['/scripts/XML_daily.asp?date_req=01/02/2003',
+                                                               '/scripts/XML_daily.asp?date_req=01/03/2003'])
+
+    def test_get_rates_cached(self):
+        cbr_rates.get_rates(['2003-02'], self.base_url, self.folder)
+        cbr_rates.get_rates(['2003-02', '2003-03'], self.base_url, self.folder)
+        self.assertEqual(len(RecordedCBRHandler.requests), 2)
+
+    def test_update_csv(self):
+        file_name = os.path.join(self.folder, 'currencies.csv')
+        with open(file_name, 'w') as file:
+            file.write('date,BYR,EUR,KZT,UAH,USD\n2003-01,0.0164252,33.2719,0.203925,5.9419,31.7844\n')
+        df = cbr_rates.update_csv(file_name, '2003-03', self.base_url, self.folder)
+        self.assertEqual(list(df['date']), ['2003-01', '2003-02', '2003-03'])
+        self.assertEqual(len(RecordedCBRHandler.requests), 2)
+        cbr_rates.update_csv(file_name, '2003-03', self.base_url, self.folder)
+        with open(file_name) as file:
+            self.assertEqual(len(file.readlines()), 4)
+        self.assertEqual(len(RecordedCBRHandler.requests), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+import json
+import threading
+import time
+import unittest
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import TestCase
+from urllib.parse import urlparse, parse_qs
+import hh_harvester
+
+
+def make_vacancies():
+    # 1500 вакансий равномерно по декабрю и 3000 за 50 минут 5 декабря. Каждая пятая без зарплаты.
+    start = datetime(2022, 12, 1)
+    dates = [start + timedelta(minutes=20 * i) for i in range(1500)]
+    dates += [datetime(2022, 12, 5, 10) + timedelta(seconds=i) for i in range(3000)]
+    dates.sort()
+    return [{'id': str(number), 'name': f'Программист {number}', 'area': {'name': 'Москва'},
+             'published_at': date.strftime('%Y-%m-%dT%H:%M:%S+0300'),
+             'salary': None if number % 5 == 0 else {'from': number, 'to': None, 'currency': 'RUR'}}
+            for number, date in enumerate(dates)]
+
+
+class FakeVacanciesHandler(BaseHTTPRequestHandler):
+    # Имитация /vacancies: границы окна включаются, выдача обрезается на hh_cap, первый запрос получает 429.
+    vacancies = make_vacancies()
+    requests = []
+    lock = threading.Lock()
+
+    def do_GET(self):
+        params = {key: value[0] for key, value in parse_qs(urlparse(self.path).query).items()}
+        with FakeVacanciesHandler.lock:
+            FakeVacanciesHandler.requests.append(params)
+            first = len(FakeVacanciesHandler.requests) == 1
+        if first:
+            self.send_response(429)
+            self.send_header('Retry-After', '0')
+            self.end_headers()
+            return
+        found = [vacancy for vacancy in self.vacancies
+                 if params['date_from'] <= vacancy['published_at'][:19] <= params['date_to']]
+        per_page, page = int(params['per_page']), int(params['page'])
+        body = json.dumps({'found': len(found), 'pages': min(-(-len(found) // per_page), hh_harvester.hh_cap // per_page),
+                           'items': found[:hh_harvester.hh_cap][page * per_page:(page + 1) * per_page]}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class HarvesterTests(TestCase):
+    def setUp(self):
+        FakeVacanciesHandler.requests = []
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), FakeVacanciesHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base_url = f'http://127.0.0.1:{self.server.server_port}/vacancies'
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_month_window(self):
+        self.assertEqual(hh_harvester.month_window(datetime(2022, 12, 21, 22)),
+                         [(datetime(2022, 12, 1), datetime(2022, 12, 21, 23, 59, 59))])
+
+    def test_split_window(self):
+        windows = hh_harvester.Harvester.split_window((datetime(2022, 12, 1), datetime(2022, 12, 1, 0, 0, 2)), 4)
+        self.assertEqual(windows, [(datetime(2022, 12, 1), datetime(2022, 12, 1, 0, 0, 1)),
+                                   (datetime(2022, 12, 1, 0, 0, 1), datetime(2022, 12, 1, 0, 0, 2))])
+
+    def test_harvest(self):
+        harvester = hh_harvester.Harvester(self.base_url, rate=1000, workers=8, backoff=0)
+        df = harvester.harvest(hh_harvester.month_window(datetime(2022, 12, 31)))
+        self.assertEqual(harvester.found, 4500)
+        self.assertEqual(harvester.received, 4500)
+        self.assertEqual(harvester.truncated, [])
+        self.assertEqual(len(df), 3600)
+        self.assertEqual(list(df.columns), hh_harvester.columns)
+        self.assertEqual(list(df['published_at']), sorted(df['published_at']))
+        self.assertTrue(all(window[1] == next_window[0]
+                            for window, next_window in zip(harvester.windows, harvester.windows[1:])))
+        self.assertEqual(harvester.requests_count, len(FakeVacanciesHandler.requests))
+        self.assertLess(harvester.requests_count, 70)
+
+    def test_token_bucket(self):
+        bucket = hh_harvester.TokenBucket(rate=50, capacity=1)
+        start = time.monotonic()
+        for _ in range(6):
+            bucket.acquire()
+        self.assertGreaterEqual(time.monotonic() - start, 0.09)
+
+
+if __name__ == '__main__':
+    unittest.main()
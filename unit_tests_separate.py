@@ -0,0 +1,93 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import TestCase
+import separate
+
+header = 'name,salary_from,salary_to,salary_currency,area_name,published_at\n'
+
+
+def make_rows(start, stop, name='Аналитик'):
+    return ''.join(f'{name} {i},{1000 * i},{2000 * i},RUR,Москва,{2020 + i % 3}-0{1 + i % 9}-05T10:00:00+0300\n'
+                   for i in range(start, stop))
+
+
+class SeparateTests(TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.file_name = os.path.join(self.folder, 'vacancies.csv')
+        self.parts_folder = os.path.join(self.folder, 'parts')
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def write_source(self, text):
+        with open(self.file_name, 'w', encoding='utf8') as file:
+            file.write(text)
+
+    def read_parts(self, folder):
+        parts = {}
+        for file_name in sorted(os.listdir(folder)):
+            if file_name.startswith('part_'):
+                with open(os.path.join(folder, file_name), encoding='utf8') as file:
+                    parts[file_name] = file.read()
+        return parts
+
+    def full_run(self, text):
+        file_name = os.path.join(self.folder, 'full.csv')
+        folder = os.path.join(self.folder, 'full')
+        with open(file_name, 'w', encoding='utf8') as file:
+            file.write(text)
+        separate.main(file_name, folder, chunk_size=4)
+        return self.read_parts(folder)
+
+    def read_state(self):
+        with open(os.path.join(self.parts_folder, separate.state_file_name), encoding='utf8') as file:
+            return json.load(file)
+
+    def test_no_state_without_incremental(self):
+        self.write_source(header + make_rows(0, 10))
+        separate.main(self.file_name, self.parts_folder, chunk_size=4)
+        self.assertNotIn(separate.state_file_name, os.listdir(self.parts_folder))
+
+    def test_incremental_append(self):
+        text = header + make_rows(0, 10)
+        self.write_source(text)
+        separate.main(self.file_name, self.parts_folder, chunk_size=4, incremental=True)
+        text += make_rows(10, 25)
+        self.write_source(text)
+        separate.main(self.file_name, self.parts_folder, chunk_size=4, incremental=True)
+        self.assertEqual(self.read_parts(self.parts_folder), self.full_run(text))
+        self.assertEqual(self.read_state()['offset'], len(text.encode()))
+
+    def test_incremental_unchanged(self):
+        text = header + make_rows(0, 10)
+        self.write_source(text)
+        separate.main(self.file_name, self.parts_folder, chunk_size=4, incremental=True)
+        separate.main(self.file_name, self.parts_folder, chunk_size=4, incremental=True)
+        self.assertEqual(self.read_parts(self.parts_folder), self.full_run(text))
+
+    def test_incremental_changed_prefix(self):
+        self.write_source(header + make_rows(0, 10))
+        separate.main(self.file_name, self.parts_folder, chunk_size=4, incremental=True)
+        text = header + make_rows(0, 10, name='Программист') + make_rows(10, 12)
+        self.write_source(text)
+        separate.main(self.file_name, self.parts_folder, chunk_size=4, incremental=True)
+        parts = self.read_parts(self.parts_folder)
+        self.assertEqual(parts, self.full_run(text))
+        self.assertNotIn('Аналитик 0,', ''.join(parts.values()))
+
+    def test_incremental_same_length_rewrite(self):
+        text = header + make_rows(0, 10)
+        self.write_source(text)
+        separate.main(self.file_name, self.parts_folder, chunk_size=4, incremental=True)
+        text = text.replace('Аналитик 3,', 'Аналитик 7,')
+        self.write_source(text)
+        separate.main(self.file_name, self.parts_folder, chunk_size=4, incremental=True)
+        self.assertEqual(self.read_parts(self.parts_folder), self.full_run(text))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,26 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+
+def run_chunk(func, chunk):
+    return [func(*args) for args in chunk]
+
+
+def imap(func, tasks, processes=None, chunk_size=1, ordered=True, initializer=None, initargs=()):
+    # Выполняет func(*args) для каждого набора аргументов из tasks не более чем в processes процессах.
+    # Задачи отправляются пачками по chunk_size. При ordered=True результаты идут в порядке tasks,
+    # иначе - по мере готовности. Исключение в задаче или падение процесса (BrokenProcessPool)
+    # пробрасывается вызывающему, оставшиеся задачи при этом отменяются.
+    tasks = list(tasks)
+    if not tasks:
+        return
+    chunks = [tasks[i:i + chunk_size] for i in range(0, len(tasks), chunk_size)]
+    processes = min(processes or os.cpu_count() or 1, len(chunks))
+    with ProcessPoolExecutor(max_workers=processes, initializer=initializer, initargs=initargs) as executor:
+        futures = [executor.submit(run_chunk, func, chunk) for chunk in chunks]
+        try:
+            for future in (futures if ordered else as_completed(futures)):
+                yield from future.result()
+        except BaseException:
+            executor.shutdown(cancel_futures=True)
+            raise